@@ -19,12 +19,19 @@ Usage:
 
 import sqlite3
 import os
+import re
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
 import argparse
 import calendar
+import contextlib
+import functools
+import io
+import inspect
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
 
 # Load environment variables from .env file
 try:
@@ -34,50 +41,49 @@ except ImportError:
     # If python-dotenv is not installed, manually load .env file
     env_path = Path(__file__).parent / '.env'
     if env_path.exists():
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
+        # KEY=value lines; blank lines, comments and lines without '=' are skipped
+        _ENV_LINE = re.compile(r'^[ \t]*([^#=\s][^=\n]*)=(.*)$', re.MULTILINE)
+        os.environ.update({key.strip(): value.strip()
+                           for key, value in _ENV_LINE.findall(env_path.read_text())})
 
 # ==============================================================================
 # Configuration
 # ==============================================================================
 
 # Try to find the VRCX database automatically
+@functools.cache
 def find_vrcx_database():
-    """Locate the VRCX.sqlite3 database file."""
-    # Windows
+    """Locate the VRCX.sqlite3 database file (probed once per process)."""
+    # Only the install location for the current platform is checked
     if sys.platform == 'win32':
         appdata = os.getenv('APPDATA')
-        if appdata:
-            db_path = Path(appdata) / 'VRCX' / 'VRCX.sqlite3'
-            if db_path.exists():
-                return str(db_path)
-    
-    # Linux/Mac
-    home = Path.home()
-    possible_paths = [
-        home / '.config' / 'VRCX' / 'VRCX.sqlite3',  # Linux
-        home / 'Library' / 'Application Support' / 'VRCX' / 'VRCX.sqlite3',  # macOS
-    ]
-    
-    for path in possible_paths:
-        if path.exists():
-            return str(path)
+        if not appdata:
+            return None
+        db_path = os.path.join(appdata, 'VRCX', 'VRCX.sqlite3')
+    elif sys.platform == 'darwin':
+        db_path = os.path.expanduser('~/Library/Application Support/VRCX/VRCX.sqlite3')
+    else:
+        db_path = os.path.expanduser('~/.config/VRCX/VRCX.sqlite3')
     
-    return None
-
-
-DATABASE_PATH = os.getenv('VRCX_DATABASE_PATH') or find_vrcx_database()
+    return db_path if os.path.isfile(db_path) else None
 
-if not DATABASE_PATH:
-    print("ERROR: Could not find VRCX.sqlite3 database")
-    print("Please set VRCX_DATABASE_PATH environment variable or ensure VRCX is installed")
-    sys.exit(1)
 
-print(f"Using database: {DATABASE_PATH}")
+def resolve_database_path():
+    """
+    Return the database path from VRCX_DATABASE_PATH or auto-detection.
+    
+    Exits with an error message when no database can be found. Called from
+    main() so importing the module or running --help does no disk probing.
+    """
+    database_path = os.getenv('VRCX_DATABASE_PATH') or find_vrcx_database()
+    
+    if not database_path:
+        print("ERROR: Could not find VRCX.sqlite3 database")
+        print("Please set VRCX_DATABASE_PATH environment variable or ensure VRCX is installed")
+        sys.exit(1)
+    
+    print(f"Using database: {database_path}")
+    return database_path
 
 # ==============================================================================
 # Database Connection
@@ -86,50 +92,258 @@ print(f"Using database: {DATABASE_PATH}")
 class VRCXDatabase:
     """Interface to the VRCX SQLite database."""
     
-    def __init__(self, db_path):
+    def __init__(self, db_path, cache_results=True, immutable=False):
         self.db_path = db_path
         self.connection = None
-    
+        # Open as an unchanging read-only file (no locks or WAL checks); only
+        # safe while VRCX is closed, see --immutable
+        self.immutable = immutable
+        self.rollup_attached = False
+        # (start, end) created_at bounds held in mem.hourly_events, see preload_range()
+        self.preloaded_bounds = None
+        # Report results memoized by _cached_query until the database changes
+        self.query_cache = {} if cache_results else None
+        # PRAGMA data_version the cached results were read at, see refresh_cache()
+        self.data_version = None
+
     def connect(self):
         """Establish database connection."""
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            # Report queries are fixed SQL text, so every repeat call (per-day
+            # loops, instance/world reports) reuses the compiled statement.
+            if self.immutable:
+                self.connection = sqlite3.connect(self._read_only_uri(), uri=True, cached_statements=256)
+            else:
+                self.connection = sqlite3.connect(self.db_path, cached_statements=256)
             self.connection.row_factory = sqlite3.Row  # Return rows as dictionaries
+            # Connection-local tuning for read-heavy aggregation scans.
+            # journal_mode is left alone: it is persistent and owned by VRCX.
+            self.connection.executescript(
+                "PRAGMA query_only=ON;"          # this tool never writes
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA cache_size=-65536;"      # 64 MB page cache
+                "PRAGMA temp_store=MEMORY;"      # GROUP BY / DISTINCT temp b-trees in RAM
+                "PRAGMA mmap_size=268435456;"    # 256 MB memory-mapped reads
+            )
             print(f"[OK] Connected to database")
         except sqlite3.Error as e:
             print(f"✗ Database connection failed: {e}")
             sys.exit(1)
     
+    def _read_only_uri(self):
+        """Return the read-only SQLite URI for the database, immutable if requested."""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        return uri
+    
+    def clear_cache(self):
+        """Drop all memoized report results."""
+        if self.query_cache is not None:
+            self.query_cache.clear()
+    
+    def refresh_cache(self):
+        """
+        Drop memoized results if VRCX has written to the database since they were read.
+        
+        PRAGMA data_version only changes when another connection commits, so
+        this is a single cheap check per cached call. Immutable databases
+        never change and skip it.
+        """
+        if self.query_cache is None or self.immutable:
+            return
+        if not self.connection:
+            self.connect()
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if version != self.data_version:
+            if self.data_version is not None:
+                self.query_cache.clear()
+            self.data_version = version
+    
     def close(self):
         """Close database connection."""
         if self.connection:
             self.connection.close()
+            self.connection = None
             print(f"[OK] Database connection closed")
     
+    def __enter__(self):
+        """Connect on entering a ``with`` block: ``with VRCXDatabase(path) as db:``."""
+        if not self.connection:
+            self.connect()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def execute(self, query, params=None):
         """Execute a query and return results."""
+        return list(self.iter_execute(query, params))
+    
+    def iter_execute(self, query, params=None, arraysize=1000, raw=False):
+        """
+        Execute a query and yield rows in batches of ``arraysize``.
+        
+        Use this for single-pass consumers so large resultsets are never
+        held in memory at once. On error the message is printed and the
+        generator simply stops, matching execute() returning [].
+        
+        With raw=True rows are plain tuples instead of sqlite3.Row, for
+        internal loops that unpack columns positionally.
+        """
         if not self.connection:
             self.connect()
         
+        cursor = self.connection.cursor()
+        if raw:
+            cursor.row_factory = None
         try:
-            cursor = self.connection.cursor()
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            return cursor.fetchall()
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(arraysize)
+                if not rows:
+                    break
+                yield from rows
         except sqlite3.Error as e:
             print(f"✗ Query failed: {e}")
             print(f"Query: {query}")
             if params:
                 print(f"Params: {params}")
-            return []
+        finally:
+            cursor.close()
+    
+    def ensure_indexes(self):
+        """
+        Create covering indexes used by the report queries (opt-in).
+
+        The database belongs to VRCX, so this is only run when explicitly
+        requested with --create-indexes. Statements are idempotent.
+        """
+        if not self.connection:
+            self.connect()
+
+        try:
+            self.connection.execute("PRAGMA query_only=OFF")
+            self.connection.executescript(
+                "CREATE INDEX IF NOT EXISTS idx_vrcx_query_jl_created "
+                "ON gamelog_join_leave(created_at, display_name, location);"
+                # Instance reports filter on one location, then a day range
+                "CREATE INDEX IF NOT EXISTS idx_vrcx_query_jl_location "
+                "ON gamelog_join_leave(location, created_at, display_name);"
+                "CREATE INDEX IF NOT EXISTS idx_vrcx_query_loc_created "
+                "ON gamelog_location(created_at);"
+                # Refresh planner stats for the report tables only, not all of VRCX's
+                "ANALYZE gamelog_join_leave;"
+                "ANALYZE gamelog_location;"
+            )
+            print(f"[OK] Report indexes are up to date")
+        except sqlite3.Error as e:
+            print(f"WARNING: Could not create indexes: {e}")
+        finally:
+            self.connection.execute("PRAGMA query_only=ON")
+
+    def attach_rollup(self, rollup_path):
+        """
+        Attach and incrementally refresh the hourly presence rollup.
+
+        The rollup holds one row per (date, hour, display_name) and lives in its
+        own SQLite file, so the VRCX database is never modified. Each refresh
+        only scans events at or after the stored watermark.
+        """
+        if not self.connection:
+            self.connect()
+
+        try:
+            Path(rollup_path).parent.mkdir(parents=True, exist_ok=True)
+            self.connection.execute("PRAGMA query_only=OFF")
+            self.connection.execute("ATTACH DATABASE ? AS rollup", (str(rollup_path),))
+            self.connection.executescript("""
+                -- Rebuildable cache: skip fsyncs, keep the journal for atomic refreshes
+                PRAGMA rollup.synchronous=OFF;
+                CREATE TABLE IF NOT EXISTS rollup.hourly_presence (
+                    date TEXT NOT NULL,
+                    hour INTEGER NOT NULL,
+                    display_name TEXT NOT NULL,
+                    PRIMARY KEY (date, hour, display_name)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS rollup.meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+
+            meta = {row['key']: row['value'] for row in self.connection.execute("SELECT key, value FROM rollup.meta")}
+            with self.connection:
+                # A rollup built from a different VRCX database is useless
+                if meta.get('source') != str(self.db_path):
+                    self.connection.execute("DELETE FROM rollup.hourly_presence")
+                    meta = {}
+                watermark = meta.get('watermark') or ''
+                high_mark = self.connection.execute("SELECT MAX(created_at) FROM gamelog_join_leave").fetchone()[0] or ''
+                self.connection.execute("""
+                    INSERT OR IGNORE INTO rollup.hourly_presence (date, hour, display_name)
+                    SELECT substr(created_at, 1, 10), CAST(substr(created_at, 12, 2) AS INTEGER), display_name
+                    FROM gamelog_join_leave
+                    WHERE created_at >= ? AND created_at <= ? AND display_name IS NOT NULL
+                """, (watermark, high_mark))
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO rollup.meta (key, value) VALUES (?, ?)",
+                    [('source', str(self.db_path)), ('watermark', high_mark)])
+            self.rollup_attached = True
+            print(f"[OK] Hourly rollup ready ({rollup_path})")
+        except (sqlite3.Error, OSError) as e:
+            print(f"WARNING: Could not prepare hourly rollup, using live queries: {e}")
+        finally:
+            self.connection.execute("PRAGMA query_only=ON")
+
+    def preload_range(self, start_date_str, end_date_str):
+        """
+        Copy a date range's hourly event counts into an in-memory database.
+        
+        Report queries whose bounds fall inside the preloaded range read
+        ``mem.hourly_events`` (one row per date, hour and display_name with
+        its event count) instead of rescanning gamelog_join_leave, so a
+        report that runs several aggregations over the same days pays for a
+        single scan. On failure queries keep reading the live table.
+        """
+        bounds = _date_bounds(start_date_str, end_date_str)
+        self.connection.execute("PRAGMA query_only=OFF")
+        try:
+            if self.preloaded_bounds is None:
+                self.connection.execute("ATTACH DATABASE ':memory:' AS mem")
+            self.preloaded_bounds = None
+            self.connection.executescript("""
+                DROP TABLE IF EXISTS mem.hourly_events;
+                CREATE TABLE mem.hourly_events (
+                    date TEXT NOT NULL,
+                    hour INTEGER NOT NULL,
+                    display_name TEXT,
+                    events INTEGER NOT NULL
+                );
+            """)
+            with self.connection:
+                self.connection.execute("""
+                    INSERT INTO mem.hourly_events (date, hour, display_name, events)
+                    SELECT
+                        substr(created_at, 1, 10),
+                        CAST(substr(created_at, 12, 2) AS INTEGER),
+                        display_name,
+                        COUNT(*)
+                    FROM gamelog_join_leave
+                    WHERE created_at >= ? AND created_at < ?
+                    GROUP BY 1, 2, 3
+                """, bounds)
+            self.connection.execute("CREATE INDEX mem.idx_hourly_events_date ON hourly_events(date, hour)")
+            self.preloaded_bounds = bounds
+        except sqlite3.Error as e:
+            print(f"WARNING: Could not preload {start_date_str} to {end_date_str}, using live queries: {e}")
+        finally:
+            self.connection.execute("PRAGMA query_only=ON")
     
     def get_table_names(self):
         """Get list of all tables in database."""
         query = "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-        rows = self.execute(query)
-        return [row['name'] for row in rows]
+        return [name for (name,) in self.iter_execute(query, raw=True)]
 
 
 # ==============================================================================
@@ -190,12 +404,214 @@ def load_logo_from_url(url):
 # Query Functions
 # ==============================================================================
 
+# "HH:00" labels for the hour column of reports and exports, indexed by hour
+HOUR_LABELS = tuple(f"{h:02d}:00" for h in range(24))
+
+# Bar positions and "HH" tick labels for the hourly charts
+CHART_HOURS = tuple(range(24))
+CHART_HOUR_TICKS = tuple(f"{h:02d}" for h in CHART_HOURS)
+
+# Day names indexed by SQLite's strftime('%w') day_of_week (Sunday=0 to Saturday=6)
+DAY_NAMES = ('Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday')
+
+
+def _date_bounds(start_date_str, end_date_str=None):
+    """
+    Convert an inclusive date range into half-open created_at bounds.
+
+    created_at is stored as ISO 8601 text, so comparing it against bare
+    'YYYY-MM-DD' strings is equivalent to DATE(created_at) BETWEEN start AND end
+    while still letting SQLite use an index on created_at.
+
+    Returns:
+        Tuple of (start_date_str, day after end_date_str)
+    """
+    end = datetime.fromisoformat(end_date_str or start_date_str).date() + timedelta(days=1)
+    return start_date_str, end.isoformat()
+
+
+def _date_range(start_date_str, end_date_str):
+    """Return every 'YYYY-MM-DD' date from start_date_str to end_date_str inclusive."""
+    # ISO parse/format skip the strptime/strftime format machinery
+    start = datetime.fromisoformat(start_date_str).date()
+    days = (datetime.fromisoformat(end_date_str).date() - start).days + 1
+    return [(start + timedelta(days=offset)).isoformat() for offset in range(days)]
+
+
+def _prefix_bounds(prefix):
+    """
+    Convert a string prefix into half-open [low, high) bounds.
+    
+    ``col >= low AND col < high`` matches exactly the values starting with
+    ``prefix`` (like SUBSTR(col, 1, len) = prefix) but can use an index on col.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _fill_hours(rows, col, last_hour=23):
+    """
+    Expand (hour, value) rows into one {'hour', col} dict per hour 0..last_hour.
+
+    Queries only return hours that have data; missing hours are reported as 0.
+    """
+    counts = dict(rows)
+    return [{'hour': hour, col: counts.get(hour, 0)} for hour in range(last_hour + 1)]
+
+
+def _cache_key(method_name, args, today):
+    """Build the query_cache key for a VRCXQuery call; ``today`` is VRCXQuery.today."""
+    return (method_name, args, today)
+
+
+def _cached_query(method):
+    """
+    Memoize a VRCXQuery method on its database for the rest of the run.
+    
+    The print, chart and export steps of one run all ask for the same report,
+    so the cache lives on the VRCXDatabase. Arguments are bound to the method
+    signature first, so get_x(a, b), get_x(start_date_str=a, end_date_str=b)
+    and defaulted calls share one entry. Keys include today's date so "today"
+    defaults never resolve to a stale day, and the cache is dropped whenever
+    VRCX commits new events (see VRCXDatabase.refresh_cache). Disabled when
+    the database was created with cache_results=False (--no-cache).
+    """
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.db.query_cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        self.db.refresh_cache()
+        key = _cache_key(method.__name__, bound.args[1:], self.today)
+        if key not in cache:
+            cache[key] = method(self, *args, **kwargs)
+        return cache[key]
+    return wrapper
+
+
 class VRCXQuery:
-    """Query helper for common VRCX analysis tasks."""
+    """
+    Query helper for common VRCX analysis tasks.
+    
+    gamelog_join_leave.created_at is ISO 8601 text ('2025-01-31T18:05:00.000Z'),
+    so per-row date and hour keys are read with fixed-offset substr() instead of
+    DATE()/strftime(), which re-parse the whole timestamp for every row scanned.
+    """
+    
+    DAY_BUNDLE_QUERY = """
+        SELECT 
+            CAST(substr(created_at, 12, 2) AS INTEGER) as hour,
+            COUNT(display_name) as people,
+            COUNT(DISTINCT display_name) as unique_visitors
+        FROM gamelog_join_leave
+        WHERE created_at >= ? AND created_at < ?
+        GROUP BY hour
+        """
+    
+    PRELOADED_DAY_BUNDLE_QUERY = """
+        SELECT 
+            hour,
+            SUM(CASE WHEN display_name IS NOT NULL THEN events ELSE 0 END) as people,
+            COUNT(display_name) as unique_visitors
+        FROM mem.hourly_events
+        WHERE date >= ? AND date < ?
+        GROUP BY hour
+        """
     
     def __init__(self, db):
         self.db = db
+        self._today = None
+        self._today_date = None
+    
+    @property
+    def today(self):
+        """Today's date as 'YYYY-MM-DD', refreshed if the process runs past midnight."""
+        current = datetime.now().date()
+        if current != self._today_date:
+            self._today_date = current
+            self._today = current.strftime('%Y-%m-%d')
+        return self._today
+    
+    def _last_hour(self, date_str):
+        """Return the last hour to report for date_str: the current hour today, else 23."""
+        if date_str != self.today:
+            return 23
+        return datetime.now().hour
+
+    def _is_preloaded(self, bounds):
+        """Return True if the preloaded in-memory range covers ``bounds``."""
+        preloaded = self.db.preloaded_bounds
+        return preloaded is not None and preloaded[0] <= bounds[0] and bounds[1] <= preloaded[1]
+    
+    def _events_source(self, bounds):
+        """
+        Return a (date, hour, display_name, events) relation for total-event queries.
+        
+        Reads the preloaded in-memory range when it covers ``bounds``,
+        otherwise derives the same columns from gamelog_join_leave with one
+        event per row. Both forms take the two ``bounds`` parameters.
+        """
+        if self._is_preloaded(bounds):
+            return """(
+            SELECT date, hour, display_name, events
+            FROM mem.hourly_events
+            WHERE date >= ? AND date < ?
+        )"""
+        return """(
+            SELECT
+                substr(created_at, 1, 10) as date,
+                CAST(substr(created_at, 12, 2) AS INTEGER) as hour,
+                display_name,
+                1 as events
+            FROM gamelog_join_leave
+            WHERE created_at >= ? AND created_at < ?
+        )"""
+    
+    def _hourly_unique_count(self, bounds):
+        """
+        Return the aggregate counting distinct visitors within one (date, hour) group.
+        
+        The preloaded range and the rollup already hold one row per (date,
+        hour, display_name), so a plain COUNT is exact there and skips the
+        DISTINCT temp b-tree. Groups spanning several hours still need DISTINCT.
+        """
+        if self._is_preloaded(bounds) or self.db.rollup_attached:
+            return "COUNT(display_name)"
+        return "COUNT(DISTINCT display_name)"
+    
+    def _presence_source(self, bounds):
+        """
+        Return a (date, hour, display_name) relation for unique-visitor queries.
+
+        Reads the preloaded in-memory range or the attached hourly rollup when
+        available, otherwise derives the same columns from gamelog_join_leave.
+        All forms take the two ``bounds`` parameters.
+        """
+        if self._is_preloaded(bounds):
+            return """(
+            SELECT date, hour, display_name
+            FROM mem.hourly_events
+            WHERE date >= ? AND date < ?
+        )"""
+        if self.db.rollup_attached:
+            return """(
+            SELECT date, hour, display_name
+            FROM rollup.hourly_presence
+            WHERE date >= ? AND date < ?
+        )"""
+        return """(
+            SELECT
+                substr(created_at, 1, 10) as date,
+                CAST(substr(created_at, 12, 2) AS INTEGER) as hour,
+                display_name
+            FROM gamelog_join_leave
+            WHERE created_at >= ? AND created_at < ?
+        )"""
     
+    @_cached_query
     def get_location_history(self, date_str=None):
         """
         Get your location/instance history for a specific date.
@@ -207,11 +623,10 @@ class VRCXQuery:
             List of location entries with timestamps and duration.
         """
         if date_str is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
+            date_str = self.today
         
         query = """
         SELECT 
-            id,
             created_at,
             location,
             world_id,
@@ -219,13 +634,14 @@ class VRCXQuery:
             time as duration_seconds,
             group_name
         FROM gamelog_location
-        WHERE DATE(created_at) = ?
+        WHERE created_at >= ? AND created_at < ?
         ORDER BY created_at ASC
         """
         
-        results = self.db.execute(query, (date_str,))
+        results = self.db.execute(query, _date_bounds(date_str))
         return results
     
+    @_cached_query
     def get_join_leave_events(self, location=None, date_str=None):
         """
         Get join/leave events for a specific location and date.
@@ -238,12 +654,11 @@ class VRCXQuery:
             List of join/leave events with user info.
         """
         if date_str is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
+            date_str = self.today
         
         if location:
             query = """
             SELECT 
-                id,
                 created_at,
                 type,
                 display_name,
@@ -251,14 +666,13 @@ class VRCXQuery:
                 location,
                 time
             FROM gamelog_join_leave
-            WHERE location = ? AND DATE(created_at) = ?
+            WHERE location = ? AND created_at >= ? AND created_at < ?
             ORDER BY created_at ASC
             """
-            results = self.db.execute(query, (location, date_str))
+            results = self.db.execute(query, (location, *_date_bounds(date_str)))
         else:
             query = """
             SELECT 
-                id,
                 created_at,
                 type,
                 display_name,
@@ -266,13 +680,14 @@ class VRCXQuery:
                 location,
                 time
             FROM gamelog_join_leave
-            WHERE DATE(created_at) = ?
+            WHERE created_at >= ? AND created_at < ?
             ORDER BY created_at ASC
             """
-            results = self.db.execute(query, (date_str,))
+            results = self.db.execute(query, _date_bounds(date_str))
         
         return results
     
+    @_cached_query
     def get_hour_by_hour_summary(self, date_str=None):
         """
         Get hour-by-hour summary of instances and people for a specific date.
@@ -283,34 +698,91 @@ class VRCXQuery:
         Hour | Unique People
         """
         if date_str is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
+            date_str = self.today
         
-        # Check if this is today's date
-        is_today = date_str == datetime.now().strftime('%Y-%m-%d')
-        current_hour = datetime.now().hour if is_today else 23
+        # Today's report stops at the current hour
+        current_hour = self._last_hour(date_str)
         
-        query = """
-        WITH hours AS (
-            SELECT 0 AS hour UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
-            UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
-            UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10 UNION ALL SELECT 11
-            UNION ALL SELECT 12 UNION ALL SELECT 13 UNION ALL SELECT 14 UNION ALL SELECT 15
-            UNION ALL SELECT 16 UNION ALL SELECT 17 UNION ALL SELECT 18 UNION ALL SELECT 19
-            UNION ALL SELECT 20 UNION ALL SELECT 21 UNION ALL SELECT 22 UNION ALL SELECT 23
-        )
-        SELECT 
-            h.hour,
-            COUNT(j.display_name) as unique_people
-        FROM hours h
-        LEFT JOIN gamelog_join_leave j ON DATE(j.created_at) = ? AND CAST(strftime('%H', j.created_at) AS INTEGER) = h.hour
-        WHERE h.hour <= ?
-        GROUP BY h.hour
-        ORDER BY h.hour ASC
+        bundle = self.get_day_bundle(date_str)
+        return [{'hour': hour, 'unique_people': bundle.get(hour, (0, 0))[0]}
+                for hour in range(current_hour + 1)]
+    
+    @_cached_query
+    def get_day_bundle(self, date_str=None):
         """
+        Get total and unique hourly counts for a specific date in one pass.
         
-        results = self.db.execute(query, (date_str, current_hour))
-        return results
+        The day's join/leave rows are scanned once and the result is cached,
+        so the print, chart and export paths for the same date share a single
+        query.
+        
+        Returns:
+            Dict mapping hour (0-23) to (people, unique_visitors) for hours with data.
+        """
+        if date_str is None:
+            date_str = self.today
+        
+        bounds = _date_bounds(date_str)
+        query = self.PRELOADED_DAY_BUNDLE_QUERY if self._is_preloaded(bounds) else self.DAY_BUNDLE_QUERY
+        return {
+            hour: (people, unique_visitors)
+            for hour, people, unique_visitors in self.db.iter_execute(query, bounds, raw=True)
+        }
     
+    def prefetch_location_hours(self, start_date_str, end_date_str, instance_id=None, world_id=None):
+        """
+        Warm the per-day hourly instance or world caches with one ranged query.
+        
+        The date-range instance/world reports ask for each day separately;
+        this groups the whole range by (date, hour) once and stores every
+        day's all-visitor and unique-visitor results under the keys those
+        per-day calls use. Does nothing when caching is disabled.
+        
+        Args:
+            start_date_str: First date 'YYYY-MM-DD'
+            end_date_str: Last date 'YYYY-MM-DD' (inclusive)
+            instance_id: Full instance ID to filter on, or
+            world_id: World ID prefix to filter on
+        """
+        cache = self.db.query_cache
+        if cache is None:
+            return
+        if instance_id is not None:
+            location_filter, location_params = "location = ?", (instance_id,)
+            methods, target = ('get_hour_by_hour_summary_for_instance', 'get_unique_visitors_by_hour_for_instance'), instance_id
+        else:
+            location_filter, location_params = "location >= ? AND location < ?", _prefix_bounds(world_id)
+            methods, target = ('get_hour_by_hour_summary_for_world', 'get_unique_visitors_by_hour_for_world'), world_id
+        
+        query = f"""
+        SELECT 
+            substr(created_at, 1, 10) as date,
+            CAST(substr(created_at, 12, 2) AS INTEGER) as hour,
+            COUNT(display_name) as unique_people,
+            COUNT(DISTINCT display_name) as unique_visitors
+        FROM gamelog_join_leave
+        WHERE created_at >= ? AND created_at < ? AND {location_filter}
+        GROUP BY date, hour
+        """
+        
+        # Check for new VRCX writes first so the seeded entries are not dropped
+        self.db.refresh_cache()
+        days = {}
+        for date_str, hour, people, unique_visitors in self.db.iter_execute(
+                query, (*_date_bounds(start_date_str, end_date_str), *location_params), raw=True):
+            days.setdefault(date_str, []).append((hour, people, unique_visitors))
+        
+        today = self.today
+        current_hour = self._last_hour(today)
+        for date_str in _date_range(start_date_str, end_date_str):
+            rows = days.get(date_str, ())
+            last_hour = current_hour if date_str == today else 23
+            cache[_cache_key(methods[0], (target, date_str), today)] = _fill_hours(
+                ((hour, people) for hour, people, _ in rows), 'unique_people', last_hour)
+            cache[_cache_key(methods[1], (target, date_str), today)] = _fill_hours(
+                ((hour, unique_visitors) for hour, _, unique_visitors in rows), 'unique_visitors', last_hour)
+    
+    @_cached_query
     def get_hour_by_hour_average(self, start_date_str=None, end_date_str=None):
         """
         Get average hour-by-hour attendance across a date range.
@@ -321,40 +793,30 @@ class VRCXQuery:
         Hour | Avg People
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
+        bounds = _date_bounds(start_date_str, end_date_str)
         query = """
-        WITH hours AS (
-            SELECT 0 AS hour UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
-            UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
-            UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10 UNION ALL SELECT 11
-            UNION ALL SELECT 12 UNION ALL SELECT 13 UNION ALL SELECT 14 UNION ALL SELECT 15
-            UNION ALL SELECT 16 UNION ALL SELECT 17 UNION ALL SELECT 18 UNION ALL SELECT 19
-            UNION ALL SELECT 20 UNION ALL SELECT 21 UNION ALL SELECT 22 UNION ALL SELECT 23
-        ),
-        hourly_data AS (
+        WITH hourly_data AS (
             SELECT 
-                DATE(created_at) as date,
-                CAST(strftime('%H', created_at) AS INTEGER) as hour,
-                COUNT(*) as total_people
-            FROM gamelog_join_leave
-            WHERE DATE(created_at) BETWEEN ? AND ?
-            GROUP BY DATE(created_at), hour
+                date,
+                hour,
+                SUM(events) as total_people
+            FROM {events}
+            GROUP BY date, hour
         )
         SELECT 
-            h.hour,
-            CAST(ROUND(AVG(COALESCE(hd.total_people, 0))) AS INTEGER) as avg_unique_people
-        FROM hours h
-        LEFT JOIN hourly_data hd ON h.hour = hd.hour
-        GROUP BY h.hour
-        ORDER BY h.hour ASC
-        """
+            hour,
+            CAST(ROUND(AVG(total_people)) AS INTEGER) as avg_unique_people
+        FROM hourly_data
+        GROUP BY hour
+        """.format(events=self._events_source(bounds))
         
-        results = self.db.execute(query, (start_date_str, end_date_str))
-        return results
+        return _fill_hours(self.db.iter_execute(query, bounds, raw=True), 'avg_unique_people')
     
+    @_cached_query
     def get_daily_hourly_summary(self, start_date_str=None, end_date_str=None):
         """
         Get hour-by-hour summary for each day in a date range.
@@ -362,26 +824,30 @@ class VRCXQuery:
         
         Returns data like:
         Date | Hour | People
+        
+        Rows are plain (date, hour, unique_people) tuples; a year of data is
+        ~8760 rows, so they skip the sqlite3.Row wrapper.
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
+        bounds = _date_bounds(start_date_str, end_date_str)
         query = """
         SELECT 
-            DATE(created_at) as date,
-            CAST(strftime('%H', created_at) AS INTEGER) as hour,
-            COUNT(*) as unique_people
-        FROM gamelog_join_leave
-        WHERE DATE(created_at) BETWEEN ? AND ?
-        GROUP BY DATE(created_at), hour
-        ORDER BY DATE(created_at) ASC, hour ASC
-        """
-        
-        results = self.db.execute(query, (start_date_str, end_date_str))
+            date,
+            hour,
+            SUM(events) as unique_people
+        FROM {events}
+        GROUP BY date, hour
+        ORDER BY date ASC, hour ASC
+        """.format(events=self._events_source(bounds))
+        
+        results = list(self.db.iter_execute(query, bounds, raw=True))
         return results
     
+    @_cached_query
     def get_day_of_week_average(self, start_date_str=None, end_date_str=None):
         """
         Get average attendance by day of week.
@@ -391,29 +857,30 @@ class VRCXQuery:
         Day of Week | Avg People
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
+        bounds = _date_bounds(start_date_str, end_date_str)
         query = """
         SELECT 
             CAST(strftime('%w', date) AS INTEGER) as day_of_week,
             ROUND(AVG(total_people)) as avg_unique_people
         FROM (
             SELECT 
-                DATE(created_at) as date,
-                COUNT(*) as total_people
-            FROM gamelog_join_leave
-            WHERE DATE(created_at) BETWEEN ? AND ?
-            GROUP BY DATE(created_at)
+                date,
+                SUM(events) as total_people
+            FROM {events}
+            GROUP BY date
         )
         GROUP BY day_of_week
         ORDER BY day_of_week
-        """
+        """.format(events=self._events_source(bounds))
         
-        results = self.db.execute(query, (start_date_str, end_date_str))
+        results = self.db.execute(query, bounds)
         return results
     
+    @_cached_query
     def get_weekly_day_of_week_breakdown(self, start_date_str=None, end_date_str=None):
         """
         Get attendance by day of week, grouped by week.
@@ -423,71 +890,55 @@ class VRCXQuery:
         Week Start | Week End | Day of Week | People
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
+        bounds = _date_bounds(start_date_str, end_date_str)
         query = """
         SELECT 
-            week_start,
-            week_end,
-            day_of_week,
-            day_name,
-            unique_people
-        FROM (
-            SELECT 
-                DATE(created_at) as date,
-                CAST(strftime('%w', created_at) AS INTEGER) as day_of_week,
-                CASE CAST(strftime('%w', created_at) AS INTEGER)
-                    WHEN 0 THEN 'Sunday'
-                    WHEN 1 THEN 'Monday'
-                    WHEN 2 THEN 'Tuesday'
-                    WHEN 3 THEN 'Wednesday'
-                    WHEN 4 THEN 'Thursday'
-                    WHEN 5 THEN 'Friday'
-                    WHEN 6 THEN 'Saturday'
-                END as day_name,
-                DATE(created_at, 'weekday 0', '-6 days') as week_start,
-                DATE(created_at, 'weekday 0') as week_end,
-                COUNT(*) as unique_people
-            FROM gamelog_join_leave
-            WHERE DATE(created_at) BETWEEN ? AND ?
-            GROUP BY DATE(created_at)
-        )
-        GROUP BY week_start, week_end, day_of_week, day_name, date
+            date,
+            CAST(strftime('%w', date) AS INTEGER) as day_of_week,
+            DATE(date, 'weekday 0', '-6 days') as week_start,
+            DATE(date, 'weekday 0') as week_end,
+            SUM(events) as unique_people
+        FROM {events}
+        GROUP BY date
         ORDER BY week_start, day_of_week
-        """
+        """.format(events=self._events_source(bounds))
         
-        results = self.db.execute(query, (start_date_str, end_date_str))
+        results = self.db.execute(query, bounds)
         return results
 
+    @_cached_query
     def get_monthly_daily_breakdown(self, start_date_str=None, end_date_str=None):
         """
         Get total attendance per day, grouped by month.
         Each row represents a calendar day within the range.
         """
         if start_date_str is None or end_date_str is None:
-            today = datetime.now()
+            today = datetime.fromisoformat(self.today)
             first_day = today.replace(day=1).strftime('%Y-%m-%d')
             last_day = today.replace(day=calendar.monthrange(today.year, today.month)[1]).strftime('%Y-%m-%d')
             start_date_str = start_date_str or first_day
             end_date_str = end_date_str or last_day
 
+        bounds = _date_bounds(start_date_str, end_date_str)
         query = """
         SELECT 
-            DATE(created_at) as date,
-            CAST(strftime('%d', created_at) AS INTEGER) as day_of_month,
-            strftime('%Y-%m', created_at) as month_label,
-            COUNT(*) as unique_people
-        FROM gamelog_join_leave
-        WHERE DATE(created_at) BETWEEN ? AND ?
-        GROUP BY DATE(created_at)
-        ORDER BY DATE(created_at)
-        """
-
-        results = self.db.execute(query, (start_date_str, end_date_str))
+            date,
+            CAST(strftime('%d', date) AS INTEGER) as day_of_month,
+            strftime('%Y-%m', date) as month_label,
+            SUM(events) as unique_people
+        FROM {events}
+        GROUP BY date
+        ORDER BY date
+        """.format(events=self._events_source(bounds))
+
+        results = self.db.execute(query, bounds)
         return results
     
+    @_cached_query
     def get_people_in_instances_by_hour(self, date_str=None):
         """
         Get detailed breakdown of who was in instances hour-by-hour.
@@ -495,31 +946,31 @@ class VRCXQuery:
         This version tracks individual people across the day.
         """
         if date_str is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
+            date_str = self.today
         
         query = """
         SELECT 
-            CAST(strftime('%H', created_at) AS INTEGER) as hour,
+            CAST(substr(created_at, 12, 2) AS INTEGER) as hour,
             location,
-            world_name,
             type,
             display_name,
             user_id,
             created_at
         FROM gamelog_join_leave
-        WHERE DATE(created_at) = ?
+        WHERE created_at >= ? AND created_at < ?
         ORDER BY hour ASC, location ASC, created_at ASC
         """
         
-        results = self.db.execute(query, (date_str,))
+        results = self.db.execute(query, _date_bounds(date_str))
         return results
     
+    @_cached_query
     def get_instance_statistics(self, date_str=None):
         """
         Get statistics about instances visited.
         """
         if date_str is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
+            date_str = self.today
         
         query = """
         SELECT 
@@ -530,14 +981,15 @@ class VRCXQuery:
             MIN(created_at) as first_visit,
             MAX(created_at) as last_visit
         FROM gamelog_location
-        WHERE DATE(created_at) = ?
+        WHERE created_at >= ? AND created_at < ?
         GROUP BY location
         ORDER BY total_time_seconds DESC
         """
         
-        results = self.db.execute(query, (date_str,))
+        results = self.db.execute(query, _date_bounds(date_str))
         return results
     
+    @_cached_query
     def get_unique_visitors_by_hour(self, date_str=None):
         """
         Get hour-by-hour count of unique visitors (each person counted once per hour).
@@ -549,34 +1001,16 @@ class VRCXQuery:
         Hour | Unique Visitors
         """
         if date_str is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
-        
-        # Check if this is today's date
-        is_today = date_str == datetime.now().strftime('%Y-%m-%d')
-        current_hour = datetime.now().hour if is_today else 23
+            date_str = self.today
         
-        query = """
-        WITH hours AS (
-            SELECT 0 AS hour UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
-            UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
-            UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10 UNION ALL SELECT 11
-            UNION ALL SELECT 12 UNION ALL SELECT 13 UNION ALL SELECT 14 UNION ALL SELECT 15
-            UNION ALL SELECT 16 UNION ALL SELECT 17 UNION ALL SELECT 18 UNION ALL SELECT 19
-            UNION ALL SELECT 20 UNION ALL SELECT 21 UNION ALL SELECT 22 UNION ALL SELECT 23
-        )
-        SELECT 
-            h.hour,
-            COUNT(DISTINCT j.display_name) as unique_visitors
-        FROM hours h
-        LEFT JOIN gamelog_join_leave j ON DATE(j.created_at) = ? AND CAST(strftime('%H', j.created_at) AS INTEGER) = h.hour
-        WHERE h.hour <= ?
-        GROUP BY h.hour
-        ORDER BY h.hour ASC
-        """
+        # Today's report stops at the current hour
+        current_hour = self._last_hour(date_str)
         
-        results = self.db.execute(query, (date_str, current_hour))
-        return results
+        bundle = self.get_day_bundle(date_str)
+        return [{'hour': hour, 'unique_visitors': bundle.get(hour, (0, 0))[1]}
+                for hour in range(current_hour + 1)]
     
+    @_cached_query
     def get_unique_visitors_daily(self, start_date_str=None, end_date_str=None):
         """
         Get unique visitors per day across a date range.
@@ -586,23 +1020,24 @@ class VRCXQuery:
         Date | Unique Visitors
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
+        bounds = _date_bounds(start_date_str, end_date_str)
         query = """
         SELECT 
-            DATE(created_at) as date,
+            date,
             COUNT(DISTINCT display_name) as unique_visitors
-        FROM gamelog_join_leave
-        WHERE DATE(created_at) BETWEEN ? AND ?
-        GROUP BY DATE(created_at)
-        ORDER BY DATE(created_at) ASC
-        """
+        FROM {presence}
+        GROUP BY date
+        ORDER BY date ASC
+        """.format(presence=self._presence_source(bounds))
         
-        results = self.db.execute(query, (start_date_str, end_date_str))
+        results = self.db.execute(query, bounds)
         return results
     
+    @_cached_query
     def get_unique_visitors_average(self, start_date_str=None, end_date_str=None):
         """
         Get average unique visitors per hour across a date range.
@@ -613,40 +1048,30 @@ class VRCXQuery:
         Hour | Avg Unique Visitors
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
+        bounds = _date_bounds(start_date_str, end_date_str)
         query = """
-        WITH hours AS (
-            SELECT 0 AS hour UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
-            UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
-            UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10 UNION ALL SELECT 11
-            UNION ALL SELECT 12 UNION ALL SELECT 13 UNION ALL SELECT 14 UNION ALL SELECT 15
-            UNION ALL SELECT 16 UNION ALL SELECT 17 UNION ALL SELECT 18 UNION ALL SELECT 19
-            UNION ALL SELECT 20 UNION ALL SELECT 21 UNION ALL SELECT 22 UNION ALL SELECT 23
-        ),
-        hourly_data AS (
+        WITH hourly_data AS (
             SELECT 
-                DATE(created_at) as date,
-                CAST(strftime('%H', created_at) AS INTEGER) as hour,
-                COUNT(DISTINCT display_name) as unique_visitors
-            FROM gamelog_join_leave
-            WHERE DATE(created_at) BETWEEN ? AND ?
-            GROUP BY DATE(created_at), hour
+                date,
+                hour,
+                {hourly_unique} as unique_visitors
+            FROM {presence}
+            GROUP BY date, hour
         )
         SELECT 
-            h.hour,
-            CAST(ROUND(AVG(COALESCE(hd.unique_visitors, 0))) AS INTEGER) as avg_unique_visitors
-        FROM hours h
-        LEFT JOIN hourly_data hd ON h.hour = hd.hour
-        GROUP BY h.hour
-        ORDER BY h.hour ASC
-        """
+            hour,
+            CAST(ROUND(AVG(unique_visitors)) AS INTEGER) as avg_unique_visitors
+        FROM hourly_data
+        GROUP BY hour
+        """.format(presence=self._presence_source(bounds), hourly_unique=self._hourly_unique_count(bounds))
         
-        results = self.db.execute(query, (start_date_str, end_date_str))
-        return results
+        return _fill_hours(self.db.iter_execute(query, bounds, raw=True), 'avg_unique_visitors')
     
+    @_cached_query
     def get_unique_visitors_day_of_week(self, start_date_str=None, end_date_str=None):
         """
         Get average unique visitors by day of week across a date range.
@@ -656,29 +1081,30 @@ class VRCXQuery:
         Day of Week | Avg Unique Visitors
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
+        bounds = _date_bounds(start_date_str, end_date_str)
         query = """
         SELECT 
             CAST(strftime('%w', date) AS INTEGER) as day_of_week,
             ROUND(AVG(unique_visitors)) as avg_unique_visitors
         FROM (
             SELECT 
-                DATE(created_at) as date,
+                date,
                 COUNT(DISTINCT display_name) as unique_visitors
-            FROM gamelog_join_leave
-            WHERE DATE(created_at) BETWEEN ? AND ?
-            GROUP BY DATE(created_at)
+            FROM {presence}
+            GROUP BY date
         )
         GROUP BY day_of_week
         ORDER BY day_of_week
-        """
+        """.format(presence=self._presence_source(bounds))
         
-        results = self.db.execute(query, (start_date_str, end_date_str))
+        results = self.db.execute(query, bounds)
         return results
     
+    @_cached_query
     def get_unique_visitors_weekly(self, start_date_str=None, end_date_str=None):
         """
         Get unique visitors by day of week, grouped by week.
@@ -688,71 +1114,55 @@ class VRCXQuery:
         Week Start | Week End | Day of Week | Unique Visitors
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
+        bounds = _date_bounds(start_date_str, end_date_str)
         query = """
         SELECT 
-            week_start,
-            week_end,
-            day_of_week,
-            day_name,
-            unique_visitors
-        FROM (
-            SELECT 
-                DATE(created_at) as date,
-                CAST(strftime('%w', created_at) AS INTEGER) as day_of_week,
-                CASE CAST(strftime('%w', created_at) AS INTEGER)
-                    WHEN 0 THEN 'Sunday'
-                    WHEN 1 THEN 'Monday'
-                    WHEN 2 THEN 'Tuesday'
-                    WHEN 3 THEN 'Wednesday'
-                    WHEN 4 THEN 'Thursday'
-                    WHEN 5 THEN 'Friday'
-                    WHEN 6 THEN 'Saturday'
-                END as day_name,
-                DATE(created_at, 'weekday 0', '-6 days') as week_start,
-                DATE(created_at, 'weekday 0') as week_end,
-                COUNT(DISTINCT display_name) as unique_visitors
-            FROM gamelog_join_leave
-            WHERE DATE(created_at) BETWEEN ? AND ?
-            GROUP BY DATE(created_at)
-        )
-        GROUP BY week_start, week_end, day_of_week, day_name, date
+            date,
+            CAST(strftime('%w', date) AS INTEGER) as day_of_week,
+            DATE(date, 'weekday 0', '-6 days') as week_start,
+            DATE(date, 'weekday 0') as week_end,
+            COUNT(DISTINCT display_name) as unique_visitors
+        FROM {presence}
+        GROUP BY date
         ORDER BY week_start, day_of_week
-        """
+        """.format(presence=self._presence_source(bounds))
         
-        results = self.db.execute(query, (start_date_str, end_date_str))
+        results = self.db.execute(query, bounds)
         return results
 
+    @_cached_query
     def get_unique_visitors_monthly(self, start_date_str=None, end_date_str=None):
         """
         Get unique visitors per day, grouped by month.
         Each person is counted once per calendar day.
         """
         if start_date_str is None or end_date_str is None:
-            today = datetime.now()
+            today = datetime.fromisoformat(self.today)
             first_day = today.replace(day=1).strftime('%Y-%m-%d')
             last_day = today.replace(day=calendar.monthrange(today.year, today.month)[1]).strftime('%Y-%m-%d')
             start_date_str = start_date_str or first_day
             end_date_str = end_date_str or last_day
 
+        bounds = _date_bounds(start_date_str, end_date_str)
         query = """
         SELECT 
-            DATE(created_at) as date,
-            CAST(strftime('%d', created_at) AS INTEGER) as day_of_month,
-            strftime('%Y-%m', created_at) as month_label,
+            date,
+            CAST(strftime('%d', date) AS INTEGER) as day_of_month,
+            strftime('%Y-%m', date) as month_label,
             COUNT(DISTINCT display_name) as unique_visitors
-        FROM gamelog_join_leave
-        WHERE DATE(created_at) BETWEEN ? AND ?
-        GROUP BY DATE(created_at)
-        ORDER BY DATE(created_at)
-        """
+        FROM {presence}
+        GROUP BY date
+        ORDER BY date
+        """.format(presence=self._presence_source(bounds))
 
-        results = self.db.execute(query, (start_date_str, end_date_str))
+        results = self.db.execute(query, bounds)
         return results
     
+    @_cached_query
     def get_unique_worlds(self, start_date_str=None, end_date_str=None):
         """
         Get list of unique worlds visited during a date range.
@@ -761,7 +1171,7 @@ class VRCXQuery:
         World ID | World Name | Visit Count
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
@@ -769,17 +1179,18 @@ class VRCXQuery:
         SELECT 
             world_id,
             world_name,
-            COUNT(DISTINCT DATE(created_at)) as visit_count,
+            COUNT(DISTINCT substr(created_at, 1, 10)) as visit_count,
             COUNT(*) as total_events
         FROM gamelog_location
-        WHERE DATE(created_at) BETWEEN ? AND ? AND world_id IS NOT NULL
+        WHERE created_at >= ? AND created_at < ? AND world_id IS NOT NULL
         GROUP BY world_id, world_name
         ORDER BY visit_count DESC, world_name ASC
         """
         
-        results = self.db.execute(query, (start_date_str, end_date_str))
+        results = self.db.execute(query, _date_bounds(start_date_str, end_date_str))
         return results
     
+    @_cached_query
     def get_unique_instances_for_world(self, world_id, start_date_str=None, end_date_str=None):
         """
         Get list of unique instances (with instance IDs) visited for a specific world during a date range.
@@ -793,7 +1204,7 @@ class VRCXQuery:
         Instance ID | Visit Count | Last Visited
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
@@ -801,18 +1212,18 @@ class VRCXQuery:
         SELECT 
             location as instance_id,
             SUBSTR(location, INSTR(location, ':') + 1) as instance_number,
-            COUNT(DISTINCT DATE(created_at)) as visit_count,
+            COUNT(DISTINCT substr(created_at, 1, 10)) as visit_count,
             MAX(created_at) as last_visited
         FROM gamelog_join_leave
-        WHERE DATE(created_at) BETWEEN ? AND ? AND SUBSTR(location, 1, ?) = ?
+        WHERE created_at >= ? AND created_at < ? AND location >= ? AND location < ?
         GROUP BY location
         ORDER BY visit_count DESC, last_visited DESC
         """
         
-        world_id_len = len(world_id)
-        results = self.db.execute(query, (start_date_str, end_date_str, world_id_len, world_id))
+        results = self.db.execute(query, (*_date_bounds(start_date_str, end_date_str), *_prefix_bounds(world_id)))
         return results
     
+    @_cached_query
     def get_hour_by_hour_summary_for_instance(self, instance_id, date_str=None):
         """
         Get hour-by-hour summary for a specific instance on a given date.
@@ -827,36 +1238,24 @@ class VRCXQuery:
             Hour-by-hour data for the specific instance
         """
         if date_str is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
+            date_str = self.today
         
-        # Check if this is today's date
-        is_today = date_str == datetime.now().strftime('%Y-%m-%d')
-        current_hour = datetime.now().hour if is_today else 23
+        # Today's report stops at the current hour
+        current_hour = self._last_hour(date_str)
         
         query = """
-        WITH hours AS (
-            SELECT 0 AS hour UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
-            UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
-            UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10 UNION ALL SELECT 11
-            UNION ALL SELECT 12 UNION ALL SELECT 13 UNION ALL SELECT 14 UNION ALL SELECT 15
-            UNION ALL SELECT 16 UNION ALL SELECT 17 UNION ALL SELECT 18 UNION ALL SELECT 19
-            UNION ALL SELECT 20 UNION ALL SELECT 21 UNION ALL SELECT 22 UNION ALL SELECT 23
-        )
         SELECT 
-            h.hour,
-            COUNT(j.display_name) as unique_people
-        FROM hours h
-        LEFT JOIN gamelog_join_leave j ON DATE(j.created_at) = ? 
-            AND CAST(strftime('%H', j.created_at) AS INTEGER) = h.hour
-            AND j.location = ?
-        WHERE h.hour <= ?
-        GROUP BY h.hour
-        ORDER BY h.hour ASC
-        """
-        
-        results = self.db.execute(query, (date_str, instance_id, current_hour))
-        return results
+            CAST(substr(created_at, 12, 2) AS INTEGER) as hour,
+            COUNT(display_name) as unique_people
+        FROM gamelog_join_leave
+        WHERE created_at >= ? AND created_at < ? AND location = ?
+        GROUP BY hour
+        """
+        
+        rows = self.db.iter_execute(query, (*_date_bounds(date_str), instance_id), raw=True)
+        return _fill_hours(rows, 'unique_people', current_hour)
     
+    @_cached_query
     def get_unique_visitors_by_hour_for_instance(self, instance_id, date_str=None):
         """
         Get hour-by-hour count of unique visitors for a specific instance.
@@ -871,36 +1270,24 @@ class VRCXQuery:
             Hour-by-hour unique visitor data for the specific instance
         """
         if date_str is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
+            date_str = self.today
         
-        # Check if this is today's date
-        is_today = date_str == datetime.now().strftime('%Y-%m-%d')
-        current_hour = datetime.now().hour if is_today else 23
+        # Today's report stops at the current hour
+        current_hour = self._last_hour(date_str)
         
         query = """
-        WITH hours AS (
-            SELECT 0 AS hour UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
-            UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
-            UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10 UNION ALL SELECT 11
-            UNION ALL SELECT 12 UNION ALL SELECT 13 UNION ALL SELECT 14 UNION ALL SELECT 15
-            UNION ALL SELECT 16 UNION ALL SELECT 17 UNION ALL SELECT 18 UNION ALL SELECT 19
-            UNION ALL SELECT 20 UNION ALL SELECT 21 UNION ALL SELECT 22 UNION ALL SELECT 23
-        )
         SELECT 
-            h.hour,
-            COUNT(DISTINCT j.display_name) as unique_visitors
-        FROM hours h
-        LEFT JOIN gamelog_join_leave j ON DATE(j.created_at) = ? 
-            AND CAST(strftime('%H', j.created_at) AS INTEGER) = h.hour
-            AND j.location = ?
-        WHERE h.hour <= ?
-        GROUP BY h.hour
-        ORDER BY h.hour ASC
-        """
-        
-        results = self.db.execute(query, (date_str, instance_id, current_hour))
-        return results
+            CAST(substr(created_at, 12, 2) AS INTEGER) as hour,
+            COUNT(DISTINCT display_name) as unique_visitors
+        FROM gamelog_join_leave
+        WHERE created_at >= ? AND created_at < ? AND location = ?
+        GROUP BY hour
+        """
+        
+        rows = self.db.iter_execute(query, (*_date_bounds(date_str), instance_id), raw=True)
+        return _fill_hours(rows, 'unique_visitors', current_hour)
     
+    @_cached_query
     def get_users_for_instance(self, instance_id, start_date_str=None, end_date_str=None):
         """
         Get list of all unique users who visited a specific instance during a date range.
@@ -914,7 +1301,7 @@ class VRCXQuery:
         User Name | Visit Count | Days Visited | First Visit | Last Visit
         """
         if start_date_str is None:
-            start_date_str = datetime.now().strftime('%Y-%m-%d')
+            start_date_str = self.today
         if end_date_str is None:
             end_date_str = start_date_str
         
@@ -922,18 +1309,19 @@ class VRCXQuery:
         SELECT 
             display_name,
             COUNT(*) as visit_count,
-            COUNT(DISTINCT DATE(created_at)) as days_visited,
+            COUNT(DISTINCT substr(created_at, 1, 10)) as days_visited,
             MIN(created_at) as first_visit,
             MAX(created_at) as last_visit
         FROM gamelog_join_leave
-        WHERE DATE(created_at) BETWEEN ? AND ? AND location = ?
+        WHERE created_at >= ? AND created_at < ? AND location = ?
         GROUP BY display_name
         ORDER BY visit_count DESC, last_visit DESC
         """
         
-        results = self.db.execute(query, (start_date_str, end_date_str, instance_id))
+        results = self.db.execute(query, (*_date_bounds(start_date_str, end_date_str), instance_id))
         return results
     
+    @_cached_query
     def get_hour_by_hour_summary_for_world(self, world_id, date_str=None):
         """
         Get hour-by-hour summary for a specific world on a given date.
@@ -949,38 +1337,24 @@ class VRCXQuery:
             Hour-by-hour data for the specific world
         """
         if date_str is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
+            date_str = self.today
         
-        # Check if this is today's date
-        is_today = date_str == datetime.now().strftime('%Y-%m-%d')
-        current_hour = datetime.now().hour if is_today else 23
+        # Today's report stops at the current hour
+        current_hour = self._last_hour(date_str)
         
         query = """
-        WITH hours AS (
-            SELECT 0 AS hour UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
-            UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
-            UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10 UNION ALL SELECT 11
-            UNION ALL SELECT 12 UNION ALL SELECT 13 UNION ALL SELECT 14 UNION ALL SELECT 15
-            UNION ALL SELECT 16 UNION ALL SELECT 17 UNION ALL SELECT 18 UNION ALL SELECT 19
-            UNION ALL SELECT 20 UNION ALL SELECT 21 UNION ALL SELECT 22 UNION ALL SELECT 23
-        )
         SELECT 
-            h.hour,
-            COUNT(j.display_name) as unique_people
-        FROM hours h
-        LEFT JOIN gamelog_join_leave j ON DATE(j.created_at) = ? 
-            AND CAST(strftime('%H', j.created_at) AS INTEGER) = h.hour
-            AND SUBSTR(j.location, 1, ?) = ?
-        WHERE h.hour <= ?
-        GROUP BY h.hour
-        ORDER BY h.hour ASC
-        """
-        
-        # Extract world_id length for substring matching
-        world_id_len = len(world_id)
-        results = self.db.execute(query, (date_str, world_id_len, world_id, current_hour))
-        return results
+            CAST(substr(created_at, 12, 2) AS INTEGER) as hour,
+            COUNT(display_name) as unique_people
+        FROM gamelog_join_leave
+        WHERE created_at >= ? AND created_at < ? AND location >= ? AND location < ?
+        GROUP BY hour
+        """
+        
+        rows = self.db.iter_execute(query, (*_date_bounds(date_str), *_prefix_bounds(world_id)), raw=True)
+        return _fill_hours(rows, 'unique_people', current_hour)
     
+    @_cached_query
     def get_unique_visitors_by_hour_for_world(self, world_id, date_str=None):
         """
         Get hour-by-hour count of unique visitors for a specific world.
@@ -996,41 +1370,25 @@ class VRCXQuery:
             Hour-by-hour unique visitor data for the specific world
         """
         if date_str is None:
-            date_str = datetime.now().strftime('%Y-%m-%d')
+            date_str = self.today
         
-        # Check if this is today's date
-        is_today = date_str == datetime.now().strftime('%Y-%m-%d')
-        current_hour = datetime.now().hour if is_today else 23
+        # Today's report stops at the current hour
+        current_hour = self._last_hour(date_str)
         
         query = """
-        WITH hours AS (
-            SELECT 0 AS hour UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
-            UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
-            UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10 UNION ALL SELECT 11
-            UNION ALL SELECT 12 UNION ALL SELECT 13 UNION ALL SELECT 14 UNION ALL SELECT 15
-            UNION ALL SELECT 16 UNION ALL SELECT 17 UNION ALL SELECT 18 UNION ALL SELECT 19
-            UNION ALL SELECT 20 UNION ALL SELECT 21 UNION ALL SELECT 22 UNION ALL SELECT 23
-        )
         SELECT 
-            h.hour,
-            COUNT(DISTINCT j.display_name) as unique_visitors
-        FROM hours h
-        LEFT JOIN gamelog_join_leave j ON DATE(j.created_at) = ? 
-            AND CAST(strftime('%H', j.created_at) AS INTEGER) = h.hour
-            AND SUBSTR(j.location, 1, ?) = ?
-        WHERE h.hour <= ?
-        GROUP BY h.hour
-        ORDER BY h.hour ASC
-        """
-        
-        # Extract world_id length for substring matching
-        world_id_len = len(world_id)
-        results = self.db.execute(query, (date_str, world_id_len, world_id, current_hour))
-        return results
+            CAST(substr(created_at, 12, 2) AS INTEGER) as hour,
+            COUNT(DISTINCT display_name) as unique_visitors
+        FROM gamelog_join_leave
+        WHERE created_at >= ? AND created_at < ? AND location >= ? AND location < ?
+        GROUP BY hour
+        """
+        
+        rows = self.db.iter_execute(query, (*_date_bounds(date_str), *_prefix_bounds(world_id)), raw=True)
+        return _fill_hours(rows, 'unique_visitors', current_hour)
 
-def print_location_history(db, date_str=None):
+def print_location_history(query, date_str=None):
     """Print location history for a date."""
-    query = VRCXQuery(db)
     locations = query.get_location_history(date_str)
     
     print(f"\n{'='*80}")
@@ -1041,16 +1399,17 @@ def print_location_history(db, date_str=None):
         print("No location data found for this date")
         return
     
+    lines = []
     for loc in locations:
         hours = loc['duration_seconds'] / 3600 if loc['duration_seconds'] else 0
-        print(f"[{loc['created_at']}] {loc['world_name']} ({loc['location']})")
-        print(f"  Duration: {hours:.2f} hours ({loc['duration_seconds']}s)")
-        print()
+        lines.append(f"[{loc['created_at']}] {loc['world_name']} ({loc['location']})")
+        lines.append(f"  Duration: {hours:.2f} hours ({loc['duration_seconds']}s)")
+        lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def print_hour_by_hour_summary(db, date_str=None, is_unique=False):
+def print_hour_by_hour_summary(query, date_str=None, is_unique=False):
     """Print hour-by-hour summary of people in instances."""
-    query = VRCXQuery(db)
     if is_unique:
         summary = query.get_unique_visitors_by_hour(date_str)
         col = 'unique_visitors'
@@ -1072,16 +1431,17 @@ def print_hour_by_hour_summary(db, date_str=None, is_unique=False):
     print(f"{'Hour':<6} {'People':<10}")
     print("-" * 50)
     
+    lines = []
     for row in summary:
-        hour = f"{row['hour']:02d}:00"
+        hour = HOUR_LABELS[row['hour']]
         people = row[col] or 0
         
-        print(f"{hour:<6} {people:<10}")
+        lines.append(f"{hour:<6} {people:<10}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def print_hour_by_hour_average(db, start_date_str=None, end_date_str=None, is_unique=False):
+def print_hour_by_hour_average(query, start_date_str=None, end_date_str=None, is_unique=False):
     """Print average hour-by-hour attendance across a date range."""
-    query = VRCXQuery(db)
     if is_unique:
         summary = query.get_unique_visitors_average(start_date_str, end_date_str)
         col = 'avg_unique_visitors'
@@ -1103,16 +1463,17 @@ def print_hour_by_hour_average(db, start_date_str=None, end_date_str=None, is_un
     print(f"{'Hour':<6} {'Avg People':<15}")
     print("-" * 50)
     
+    lines = []
     for row in summary:
-        hour = f"{row['hour']:02d}:00"
+        hour = HOUR_LABELS[row['hour']]
         avg_people = row[col] or 0
         
-        print(f"{hour:<6} {avg_people:<15}")
+        lines.append(f"{hour:<6} {avg_people:<15}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def print_daily_hourly_summary(db, start_date_str=None, end_date_str=None):
+def print_daily_hourly_summary(query, start_date_str=None, end_date_str=None):
     """Print hour-by-hour summary for each day in a date range."""
-    query = VRCXQuery(db)
     summary = query.get_daily_hourly_summary(start_date_str, end_date_str)
     
     print(f"\n{'='*60}")
@@ -1127,23 +1488,20 @@ def print_daily_hourly_summary(db, start_date_str=None, end_date_str=None):
     print(f"{'Date':<12} {'Hour':<6} {'People':<10}")
     print("-" * 60)
     
-    current_date = None
-    for row in summary:
-        date = row['date']
-        hour = f"{row['hour']:02d}:00"
-        people = row['unique_people'] or 0
-        
+    # Collect the lines and write them at once; a year of data is ~8760 rows.
+    # Rows arrive ordered by date, so each day is one consecutive group.
+    lines = []
+    for date, day_rows in groupby(summary, key=lambda row: row[0]):
         # Add blank line between dates for readability
-        if current_date and current_date != date:
-            print()
-        
-        print(f"{date:<12} {hour:<6} {people:<10}")
-        current_date = date
+        if lines:
+            lines.append("")
+        lines.extend(f"{date:<12} {HOUR_LABELS[hour]:<6} {people or 0:<10}"
+                     for _, hour, people in day_rows)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def print_day_of_week_average(db, start_date_str=None, end_date_str=None, is_unique=False):
+def print_day_of_week_average(query, start_date_str=None, end_date_str=None, is_unique=False):
     """Print average attendance by day of week."""
-    query = VRCXQuery(db)
     if is_unique:
         summary = query.get_unique_visitors_day_of_week(start_date_str, end_date_str)
         col = 'avg_unique_visitors'
@@ -1162,23 +1520,21 @@ def print_day_of_week_average(db, start_date_str=None, end_date_str=None, is_uni
         print("No data found for this date range")
         return
     
-    # Days of week (Sunday=0 to Saturday=6 in SQLite)
-    days = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-    
     # Print header
     print(f"{'Day of Week':<12} {'Avg People':<15}")
     print("-" * 40)
     
+    lines = []
     for row in summary:
-        day_name = days[row['day_of_week']]
+        day_name = DAY_NAMES[row['day_of_week']]
         avg_people = row[col] or 0
         
-        print(f"{day_name:<12} {avg_people:<15}")
+        lines.append(f"{day_name:<12} {avg_people:<15}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def print_world_list(db, start_date_str=None, end_date_str=None):
+def print_world_list(query, start_date_str=None, end_date_str=None):
     """Print list of unique worlds visited during a date range."""
-    query = VRCXQuery(db)
     worlds = query.get_unique_worlds(start_date_str, end_date_str)
     
     print(f"\n{'='*80}")
@@ -1192,18 +1548,19 @@ def print_world_list(db, start_date_str=None, end_date_str=None):
     print(f"{'World Name':<40} {'World ID':<45} {'Days':<6} {'Events':<8}")
     print("-" * 99)
     
+    lines = []
     for row in worlds:
         world_name = (row['world_name'] or 'Unknown')[:40]
         world_id = (row['world_id'] or 'Unknown')[:45]
         days = row['visit_count'] or 0
         events = row['total_events'] or 0
         
-        print(f"{world_name:<40} {world_id:<45} {days:<6} {events:<8}")
+        lines.append(f"{world_name:<40} {world_id:<45} {days:<6} {events:<8}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def print_instances_for_world(db, world_id, world_name=None, start_date_str=None, end_date_str=None):
+def print_instances_for_world(query, world_id, world_name=None, start_date_str=None, end_date_str=None):
     """Print list of unique instances for a specific world."""
-    query = VRCXQuery(db)
     instances = query.get_unique_instances_for_world(world_id, start_date_str, end_date_str)
     
     title = world_name or world_id
@@ -1219,18 +1576,19 @@ def print_instances_for_world(db, world_id, world_name=None, start_date_str=None
     print(f"{'Instance Number':<100} {'Days':<6} {'Last Visited':<20}")
     print("-" * 130)
     
+    lines = []
     for row in instances:
         instance_num = (row['instance_number'] or 'Unknown')[:100]
         days = row['visit_count'] or 0
         last_visited = row['last_visited'] or 'Unknown'
         
-        print(f"{instance_num:<100} {days:<6} {last_visited:<20}")
+        lines.append(f"{instance_num:<100} {days:<6} {last_visited:<20}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 
-def print_hour_by_hour_summary_for_world(db, world_id, world_name=None, date_str=None, is_unique=False):
+def print_hour_by_hour_summary_for_world(query, world_id, world_name=None, date_str=None, is_unique=False):
     """Print hour-by-hour summary for a specific world on a given date."""
-    query = VRCXQuery(db)
     if is_unique:
         summary = query.get_unique_visitors_by_hour_for_world(world_id, date_str)
         col = 'unique_visitors'
@@ -1252,16 +1610,17 @@ def print_hour_by_hour_summary_for_world(db, world_id, world_name=None, date_str
     print(f"{'Hour':<6} {'People':<10}")
     print("-" * 60)
     
+    lines = []
     for row in summary:
-        hour = f"{row['hour']:02d}:00"
+        hour = HOUR_LABELS[row['hour']]
         people = row[col] or 0
         
-        print(f"{hour:<6} {people:<10}")
+        lines.append(f"{hour:<6} {people:<10}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def print_hour_by_hour_summary_for_instance(db, instance_id, date_str=None, is_unique=False):
+def print_hour_by_hour_summary_for_instance(query, instance_id, date_str=None, is_unique=False):
     """Print hour-by-hour summary for a specific instance on a given date."""
-    query = VRCXQuery(db)
     if is_unique:
         summary = query.get_unique_visitors_by_hour_for_instance(instance_id, date_str)
         col = 'unique_visitors'
@@ -1272,7 +1631,7 @@ def print_hour_by_hour_summary_for_instance(db, instance_id, date_str=None, is_u
         title = f'Hour-by-Hour Summary'
     
     if date_str is None:
-        date_str = datetime.now().strftime('%Y-%m-%d')
+        date_str = query.today
     
     print(f"\n{'='*100}")
     print(f"{title} - {date_str}")
@@ -1287,20 +1646,21 @@ def print_hour_by_hour_summary_for_instance(db, instance_id, date_str=None, is_u
     print(f"{'Hour':<6} {'People':<10}")
     print("-" * 100)
     
+    lines = []
     for row in summary:
-        hour = f"{row['hour']:02d}:00"
+        hour = HOUR_LABELS[row['hour']]
         people = row[col] or 0
         
-        print(f"{hour:<6} {people:<10}")
+        lines.append(f"{hour:<6} {people:<10}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def print_users_for_instance(db, instance_id, start_date_str=None, end_date_str=None):
+def print_users_for_instance(query, instance_id, start_date_str=None, end_date_str=None):
     """Print list of unique users who visited a specific instance."""
-    query = VRCXQuery(db)
     users = query.get_users_for_instance(instance_id, start_date_str, end_date_str)
     
     if start_date_str is None:
-        start_date_str = datetime.now().strftime('%Y-%m-%d')
+        start_date_str = query.today
     if end_date_str is None:
         end_date_str = start_date_str
     
@@ -1313,11 +1673,9 @@ def print_users_for_instance(db, instance_id, start_date_str=None, end_date_str=
         print("No users found for this instance in the date range")
         return
     
-    # Calculate totals
-    total_users = len(list(users))
-    users = query.get_users_for_instance(instance_id, start_date_str, end_date_str)  # Re-query
+    # Calculate totals from the one fetched list
+    total_users = len(users)
     total_visits = sum(row['visit_count'] for row in users)
-    users = query.get_users_for_instance(instance_id, start_date_str, end_date_str)  # Re-query again
     
     print(f"\nTotal Unique Users: {total_users}")
     print(f"Total Visits: {total_visits}\n")
@@ -1326,68 +1684,59 @@ def print_users_for_instance(db, instance_id, start_date_str=None, end_date_str=
     print(f"{'User Name':<30} {'Visits':<10} {'Days':<6} {'First Visit':<20} {'Last Visit':<20}")
     print("-" * 130)
     
+    lines = []
     for row in users:
         user = (row['display_name'] or 'Unknown')[:30]
-        # Encode safely to avoid Unicode errors on Windows terminals
-        try:
-            user_safe = user.encode('ascii', 'replace').decode('ascii')
-        except:
-            user_safe = 'Unknown'
         visits = row['visit_count'] or 0
         days = row['days_visited'] or 0
         first = row['first_visit'] or 'Unknown'
         last = row['last_visit'] or 'Unknown'
         
-        try:
-            print(f"{user_safe:<30} {visits:<10} {days:<6} {first:<20} {last:<20}")
-        except UnicodeEncodeError:
-            print(f"{'<encoding-error>':<30} {visits:<10} {days:<6} {first:<20} {last:<20}")
+        lines.append(f"{user:<30} {visits:<10} {days:<6} {first:<20} {last:<20}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def print_day_of_week_average(db, start_date_str=None, end_date_str=None, is_unique=False):
+def print_weekly_day_of_week_breakdown(query, start_date_str=None, end_date_str=None, is_unique=False):
     """Print attendance by day of week for each week in the date range."""
-    query = VRCXQuery(db)
-    summary = query.get_weekly_day_of_week_breakdown(start_date_str, end_date_str)
+    if is_unique:
+        summary = query.get_unique_visitors_weekly(start_date_str, end_date_str)
+        col = 'unique_visitors'
+        title = 'Weekly Breakdown by Day of Week (Unique Visitors)'
+    else:
+        summary = query.get_weekly_day_of_week_breakdown(start_date_str, end_date_str)
+        col = 'unique_people'
+        title = 'Weekly Breakdown by Day of Week'
     
     if not summary:
         print("No data found for this date range")
         return
     
     print(f"\n{'='*60}")
-    print(f"Weekly Breakdown by Day of Week")
+    print(title)
     print(f"{start_date_str} to {end_date_str or start_date_str}")
     print(f"{'='*60}\n")
     
-    # Group by week
-    current_week = None
-    for row in summary:
-        week_key = (row['week_start'], row['week_end'])
-        
-        # Print week header when we encounter a new week
-        if current_week != week_key:
-            if current_week is not None:
-                print()  # Blank line between weeks
-            print(f"Week: {row['week_start']} to {row['week_end']}")
-            print("-" * 40)
-            current_week = week_key
-        
-        day_name = row['day_name']
-        people = row['unique_people'] or 0
-        print(f"  {day_name:<12} {people:>8}")
+    # Group by week, collecting the lines to write at once
+    lines = []
+    for (week_start, week_end), week_rows in _group_weeks(summary):
+        if lines:
+            lines.append("")  # Blank line between weeks
+        lines.append(f"Week: {week_start} to {week_end}")
+        lines.append("-" * 40)
+        lines.extend(f"  {DAY_NAMES[row['day_of_week']]:<12} {row[col] or 0:>8}" for row in week_rows)
     
-    print()
+    sys.stdout.write("\n".join(lines) + "\n\n")
 
 
-def print_monthly_summary(db, start_date_str=None, end_date_str=None, is_unique=False):
+def print_monthly_summary(query, start_date_str=None, end_date_str=None, is_unique=False):
     """Print daily totals grouped by month for the given range."""
-    today = datetime.now()
     if start_date_str is None or end_date_str is None:
+        today = datetime.fromisoformat(query.today)
         first_day = today.replace(day=1).strftime('%Y-%m-%d')
         last_day = today.replace(day=calendar.monthrange(today.year, today.month)[1]).strftime('%Y-%m-%d')
         start_date_str = start_date_str or first_day
         end_date_str = end_date_str or last_day
 
-    query = VRCXQuery(db)
     if is_unique:
         summary = query.get_unique_visitors_monthly(start_date_str, end_date_str)
         col = 'unique_visitors'
@@ -1406,24 +1755,110 @@ def print_monthly_summary(db, start_date_str=None, end_date_str=None, is_unique=
     print(f"{start_date_str} to {end_date_str}")
     print(f"{'='*60}\n")
 
-    current_month = None
-    for row in summary:
-        month_label = row['month_label']
-        if month_label != current_month:
-            if current_month is not None:
-                print()  # blank line between months
-            print(f"Month: {month_label}")
-            print("-" * 40)
-            current_month = month_label
-        print(f"  Day {row['day_of_month']:>2}: {row[col] or 0:>6} {label}")
+    # Group by month, collecting the lines to write at once
+    lines = []
+    for month_label, month_rows in groupby(summary, key=lambda row: row['month_label']):
+        if lines:
+            lines.append("")  # blank line between months
+        lines.append(f"Month: {month_label}")
+        lines.append("-" * 40)
+        lines.extend(f"  Day {row['day_of_month']:>2}: {row[col] or 0:>6} {label}" for row in month_rows)
 
-    print()
+    sys.stdout.write("\n".join(lines) + "\n\n")
 
 
 # ==============================================================================
 # Chart Generation Functions
 # ==============================================================================
 
+@functools.cache
+def _get_plt():
+    """
+    Import pyplot on the Agg backend once and return it, or None if
+    matplotlib is not installed.
+    
+    A throwaway figure with text is drawn once so the font manager, font
+    objects and Agg renderer are initialised here rather than inside the
+    first real chart. Chart worker processes call this once each: forked
+    workers (Linux) inherit the warm state, while spawned workers
+    (Windows/macOS) re-import the module and warm up on their first chart.
+    """
+    try:
+        import matplotlib
+        matplotlib.use('Agg')  # Use non-interactive backend
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("WARNING: matplotlib not installed. Install with: pip install matplotlib")
+        return None
+    
+    # Label/title styling shared by every chart; per-call kwargs only override
+    plt.rcParams.update({'axes.labelsize': 12, 'axes.titlesize': 14, 'axes.titleweight': 'bold'})
+    
+    fig = plt.figure(figsize=(1, 1))
+    fig.text(0.5, 0.5, '0', fontweight='bold')
+    fig.canvas.draw()
+    plt.close(fig)
+    return plt
+
+
+def _hourly_series(summary, col):
+    """
+    Return a 24-slot float array of summary[col] indexed by row['hour'].
+    
+    Hours missing from the summary stay 0. Built with one vectorised
+    scatter (numpy ships with matplotlib) and passed to ax.bar() as is.
+    """
+    import numpy as np
+    
+    values = np.zeros(24)
+    if summary:
+        hours, counts = zip(*((row['hour'], row[col] or 0) for row in summary))
+        values[np.fromiter(hours, dtype=np.intp, count=len(hours))] = counts
+    return values
+
+
+def _partial_path(output_file):
+    """
+    Return the temporary name a chart is written under before it is moved
+    into place. The extension is kept so the format is still inferred.
+    """
+    root, ext = os.path.splitext(str(output_file))
+    return f"{root}.partial{ext}"
+
+
+def _write_atomically(output_file, write):
+    """
+    Call write(path) on a temporary sibling of output_file, then os.replace() it.
+    
+    An interrupted or failed write never leaves a truncated chart under the
+    final name; the partial file is removed on error.
+    """
+    partial_file = _partial_path(output_file)
+    try:
+        write(partial_file)
+        os.replace(partial_file, output_file)
+    except BaseException:
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
+        raise
+
+
+def _save_chart(fig, output_file, dpi=100, tight=False):
+    """Save a matplotlib chart figure atomically (see _write_atomically)."""
+    _write_atomically(output_file, lambda path: fig.savefig(path, dpi=dpi, bbox_inches='tight' if tight else None))
+
+
+def _group_weeks(summary):
+    """
+    Split weekly breakdown rows into [((week_start, week_end), rows), ...].
+    
+    The weekly queries return rows ordered by week_start, so consecutive
+    rows already belong to the same week and can be grouped in one pass.
+    """
+    return [(week_key, list(week_rows))
+            for week_key, week_rows in groupby(summary, key=lambda row: (row['week_start'], row['week_end']))]
+
+
 def apply_logo_to_figure(fig, logo_img, position='center', alpha=0.5, max_width_ratio=0.8):
     """
     Apply a logo/watermark to a matplotlib figure.
@@ -1437,7 +1872,6 @@ def apply_logo_to_figure(fig, logo_img, position='center', alpha=0.5, max_width_
     """
     try:
         from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-        import matplotlib.pyplot as plt
         
         # Get figure size in inches and DPI
         fig_width = fig.get_figwidth()
@@ -1552,27 +1986,12 @@ def load_custom_themes():
     return custom
 
 
-# Merge themes from file/env before CLI parsing
-THEMES.update(load_custom_themes())
-
-# Optional default theme from environment
-DEFAULT_THEME_NAME = os.getenv('VRCX_THEME')
-if DEFAULT_THEME_NAME and DEFAULT_THEME_NAME not in THEMES:
-    print(f"WARNING: VRCX_THEME '{DEFAULT_THEME_NAME}' not found among available themes; ignoring")
-    DEFAULT_THEME_NAME = None
-
-
-def create_average_chart(db, output_file, start_date_str=None, end_date_str=None, chart_label='Average Hourly Attendance - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None):
+def create_average_chart(query, output_file, start_date_str=None, end_date_str=None, chart_label='Average Hourly Attendance - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None, dpi=100, tight=False):
     """Create a bar chart showing average attendance by hour."""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')  # Use non-interactive backend
-    except ImportError:
-        print("WARNING: matplotlib not installed. Install with: pip install matplotlib")
+    plt = _get_plt()
+    if plt is None:
         return
     
-    query = VRCXQuery(db)
     if is_unique:
         summary = query.get_unique_visitors_average(start_date_str, end_date_str)
     else:
@@ -1585,12 +2004,9 @@ def create_average_chart(db, output_file, start_date_str=None, end_date_str=None
     # Get the correct column name based on whether it's unique or not
     col = 'avg_unique_visitors' if is_unique else 'avg_unique_people'
     
-    # Extract data and create a dict for easy lookup
-    data_dict = {row['hour']: row[col] or 0 for row in summary}
-    
-    # Create arrays for all 24 hours, filling missing hours with 0
-    all_hours = list(range(24))
-    avg_people = [data_dict.get(h, 0) for h in all_hours]
+    # Values for all 24 hours, missing hours left at 0
+    all_hours = CHART_HOURS
+    avg_people = _hourly_series(summary, col)
     
     # Create chart
     fig, ax = plt.subplots(figsize=(10, 7))
@@ -1604,11 +2020,11 @@ def create_average_chart(db, output_file, start_date_str=None, end_date_str=None
         bar_color = '#1f77b4'
     
     ax.bar(all_hours, avg_people, color=bar_color, width=0.8)
-    ax.set_xlabel('Hour', fontsize=12)
-    ax.set_ylabel('Average People', fontsize=12)
-    ax.set_title('Average People by Hour', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Hour')
+    ax.set_ylabel('Average People')
+    ax.set_title('Average People by Hour')
     ax.set_xticks(all_hours)
-    ax.set_xticklabels([f'{h:02d}' for h in all_hours])
+    ax.set_xticklabels(CHART_HOUR_TICKS)
     ax.grid(axis='y', alpha=0.3)
     
     # Add info box at bottom
@@ -1621,152 +2037,188 @@ def create_average_chart(db, output_file, start_date_str=None, end_date_str=None
         apply_logo_to_figure(fig, logo_img, position='upper right', alpha=0.25)
     
     plt.subplots_adjust(bottom=0.12)
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    _save_chart(fig, output_file, dpi, tight)
     plt.close()
     
     print(f"[OK] Chart saved to {output_file}")
 
 
-def create_daily_chart(db, output_file, date_str=None, chart_label='Hourly Attendance - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None):
-    """Create a bar chart showing hourly attendance for a specific day."""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')  # Use non-interactive backend
-    except ImportError:
-        print("WARNING: matplotlib not installed. Install with: pip install matplotlib")
-        return
+def _daily_chart_job(query, output_file, date_str=None, is_unique=False, instance_id=None):
+    """
+    Fetch one day's hourly values as a _render_daily_charts job.
     
-    query = VRCXQuery(db)
-    if is_unique:
-        summary = query.get_unique_visitors_by_hour(date_str)
-        col = 'unique_visitors'
-        y_label = 'Unique Visitors'
+    Returns:
+        (output_file, title, people), or None if there is no data to chart.
+    """
+    if instance_id is None:
+        summary = query.get_unique_visitors_by_hour(date_str) if is_unique else query.get_hour_by_hour_summary(date_str)
+    elif is_unique:
+        summary = query.get_unique_visitors_by_hour_for_instance(instance_id, date_str)
     else:
-        summary = query.get_hour_by_hour_summary(date_str)
-        col = 'unique_people'
-        y_label = 'Unique People'
+        summary = query.get_hour_by_hour_summary_for_instance(instance_id, date_str)
     
     if not summary:
         print("No data to chart")
-        return
-    
-    # Extract data and create a dict for easy lookup
-    data_dict = {row['hour']: row[col] or 0 for row in summary}
+        return None
     
-    # Create arrays for all 24 hours, filling missing hours with 0
-    all_hours = list(range(24))
-    people = [data_dict.get(h, 0) for h in all_hours]
+    if date_str is None:
+        date_str = query.today
+    if instance_id is None:
+        title = f'Hourly Attendance - {date_str}'
+    else:
+        title = f'Instance Hourly Attendance - {date_str}\n{instance_id}'
     
-    # Create chart
-    fig, ax = plt.subplots(figsize=(10, 7))
+    # Values for all 24 hours, missing hours left at 0
+    people = _hourly_series(summary, 'unique_visitors' if is_unique else 'unique_people')
+    return output_file, title, people
+
+
+def _daily_chart_style(chart_label, is_unique=False, logo_img=None, use_color=False, theme=None, dpi=100, tight=False, instance_id=None):
+    """Return the _render_daily_charts style arguments for daily or instance charts."""
+    if instance_id is None:
+        default_bar, primary = '#1f77b4', '#2E86AB'
+        figsize, bottom, title_kwargs = (10, 7), 0.12, {}
+    else:
+        # Instance charts are wider, with a smaller two-line title and no logo
+        default_bar = primary = '#ff7f0e'
+        figsize, bottom, title_kwargs = (12, 7), 0.15, {'fontsize': 12}
+        logo_img = None
     
-    # Apply background color if color mode enabled
     if use_color:
         bg_color = (theme or {}).get('background', '#f5f5f5')
-        bar_color = (theme or {}).get('primary', '#2E86AB')
-        apply_chart_background(ax, bg_color)
+        bar_color = (theme or {}).get('primary', primary)
+        info_face = (theme or {}).get('accent', '#f0f0f0')
     else:
-        bar_color = '#1f77b4'
+        bg_color, bar_color, info_face = None, default_bar, '#f0f0f0'
+    y_label = 'Unique Visitors' if is_unique else 'Unique People'
+    return (chart_label, figsize, bottom, title_kwargs, y_label, bar_color, bg_color, info_face, logo_img, use_color, dpi, tight)
+
+
+def _render_daily_charts(jobs, chart_label, figsize, bottom, title_kwargs, y_label, bar_color, bg_color, info_face, logo_img=None, use_color=False, dpi=100, tight=False, pdf_file=None):
+    """
+    Render a batch of hourly charts on one reused figure.
     
-    ax.bar(all_hours, people, color=bar_color, width=0.8)
-    ax.set_xlabel('Hour', fontsize=12)
-    ax.set_ylabel(y_label, fontsize=12)
-    ax.set_title(f'Hourly Attendance - {date_str}', fontsize=14, fontweight='bold')
-    ax.set_xticks(all_hours)
-    ax.set_xticklabels([f'{h:02d}' for h in all_hours])
-    ax.grid(axis='y', alpha=0.3)
+    jobs is a list of (output_file, title, people) from _daily_chart_job().
+    Runs in the caller or in a worker process, so everything it needs is
+    passed in as plain picklable values. Returns the saved file paths.
+    With pdf_file set, each chart becomes a page of that one PDF instead
+    and the jobs' output files are not written.
+    """
+    plt = _get_plt()
+    if plt is None:
+        return []
     
-    # Add info box at bottom
-    info_face = (theme or {}).get('accent', '#f0f0f0') if use_color else '#f0f0f0'
+    # As in _render_week_charts, only the axes are redrawn per day; the
+    # figure-level info box and margins are set up once
+    fig, ax = plt.subplots(figsize=figsize)
     fig.text(0.5, 0.02, chart_label, ha='center', fontsize=10,
              bbox=dict(boxstyle='round', facecolor=info_face, edgecolor='#cccccc', pad=0.5))
+    fig.subplots_adjust(bottom=bottom)
     
-    # Apply logo if provided
-    if logo_img and use_color:
-        apply_logo_to_figure(fig, logo_img, position='center', alpha=0.5)
+    def draw(title, people):
+        ax.clear()
+        apply_chart_background(ax, bg_color)
+        
+        ax.bar(CHART_HOURS, people, color=bar_color, width=0.8)
+        ax.set_xlabel('Hour')
+        ax.set_ylabel(y_label)
+        ax.set_title(title, **title_kwargs)
+        ax.set_xticks(CHART_HOURS)
+        ax.set_xticklabels(CHART_HOUR_TICKS)
+        ax.grid(axis='y', alpha=0.3)
+        
+        # Apply logo if provided (it lives on the axes, so re-add after clear)
+        if logo_img and use_color:
+            apply_logo_to_figure(fig, logo_img, position='center', alpha=0.5)
     
-    plt.subplots_adjust(bottom=0.12)
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
-    plt.close()
+    def write_pdf(path):
+        # PdfPages closes the file even if a page fails; _write_atomically
+        # then removes the partial PDF
+        with PdfPages(path) as pdf:
+            for _, title, people in jobs:
+                draw(title, people)
+                pdf.savefig(fig, dpi=dpi, bbox_inches='tight' if tight else None)
     
-    print(f"[OK] Chart saved to {output_file}")
+    chart_files = []
+    try:
+        if pdf_file:
+            from matplotlib.backends.backend_pdf import PdfPages
+            _write_atomically(pdf_file, write_pdf)
+            chart_files.append(pdf_file)
+        else:
+            for output_file, title, people in jobs:
+                draw(title, people)
+                _save_chart(fig, output_file, dpi, tight)
+                chart_files.append(output_file)
+    finally:
+        plt.close(fig)
+    return chart_files
 
 
-def create_daily_chart_for_instance(db, output_file, instance_id, date_str=None, chart_label='Hourly Attendance - Instance', is_unique=False, use_color=False, theme=None):
-    """Create a bar chart showing hourly attendance for a specific instance."""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')  # Use non-interactive backend
-    except ImportError:
-        print("WARNING: matplotlib not installed. Install with: pip install matplotlib")
+def create_daily_chart(query, output_file, date_str=None, chart_label='Hourly Attendance - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None, dpi=100, tight=False):
+    """Create a bar chart showing hourly attendance for a specific day."""
+    if _get_plt() is None:
         return
     
-    query = VRCXQuery(db)
-    if is_unique:
-        summary = query.get_unique_visitors_by_hour_for_instance(instance_id, date_str)
-        col = 'unique_visitors'
-        y_label = 'Unique Visitors'
-    else:
-        summary = query.get_hour_by_hour_summary_for_instance(instance_id, date_str)
-        col = 'unique_people'
-        y_label = 'Unique People'
-    
-    if date_str is None:
-        date_str = datetime.now().strftime('%Y-%m-%d')
-    
-    if not summary:
-        print("No data to chart")
+    job = _daily_chart_job(query, output_file, date_str, is_unique)
+    if job is None:
         return
+    _render_daily_charts([job], *_daily_chart_style(chart_label, is_unique, logo_img, use_color, theme, dpi, tight))
     
-    # Extract data and create a dict for easy lookup
-    data_dict = {row['hour']: row[col] or 0 for row in summary}
+    print(f"[OK] Chart saved to {output_file}")
+
+
+def create_daily_chart_for_instance(query, output_file, instance_id, date_str=None, chart_label='Hourly Attendance - Instance', is_unique=False, use_color=False, theme=None, dpi=100, tight=False):
+    """Create a bar chart showing hourly attendance for a specific instance."""
+    if _get_plt() is None:
+        return
     
-    # Create arrays for all 24 hours, filling missing hours with 0
-    all_hours = list(range(24))
-    people = [data_dict.get(h, 0) for h in all_hours]
+    job = _daily_chart_job(query, output_file, date_str, is_unique, instance_id)
+    if job is None:
+        return
+    _render_daily_charts([job], *_daily_chart_style(chart_label, is_unique, None, use_color, theme, dpi, tight, instance_id))
     
-    # Create chart
-    fig, ax = plt.subplots(figsize=(12, 7))
-    if use_color:
-        bg_color = (theme or {}).get('background', '#f5f5f5')
-        bar_color = (theme or {}).get('primary', '#ff7f0e')
-        apply_chart_background(ax, bg_color)
-    else:
-        bar_color = '#ff7f0e'
+    print(f"[OK] Chart saved to {output_file}")
 
-    ax.bar(all_hours, people, color=bar_color, width=0.8)
-    ax.set_xlabel('Hour', fontsize=12)
-    ax.set_ylabel(y_label, fontsize=12)
-    ax.set_title(f'Instance Hourly Attendance - {date_str}\n{instance_id}', fontsize=12, fontweight='bold')
-    ax.set_xticks(all_hours)
-    ax.set_xticklabels([f'{h:02d}' for h in all_hours])
-    ax.grid(axis='y', alpha=0.3)
+
+def create_daily_charts(query, output_dir, dates, filename_prefix, run_ts, chart_label='Hourly Attendance - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None, dpi=100, tight=False, instance_id=None, max_workers=None, pdf_file=None):
+    """
+    Create one hourly chart per date, for an instance when instance_id is set.
     
-    # Add info box at bottom
-    info_face = (theme or {}).get('accent', '#f0f0f0') if use_color else '#f0f0f0'
-    fig.text(0.5, 0.02, chart_label, ha='center', fontsize=10,
-             bbox=dict(boxstyle='round', facecolor=info_face, edgecolor='#cccccc', pad=0.5))
+    Every day is fetched first (prefetched ranges make these cache hits),
+    then the charts are rendered in batches on worker processes like the
+    per-week charts. Files are named {filename_prefix}_{date}[_unique]_{run_ts}.png.
+    With pdf_file set, all days are written in-process as the pages of
+    that single PDF instead.
     
-    plt.subplots_adjust(bottom=0.15)
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
-    plt.close()
+    Returns:
+        List of chart paths (just pdf_file in PDF mode).
+    """
+    if _get_plt() is None:
+        return []
     
-    print(f"[OK] Chart saved to {output_file}")
+    suffix = f"{'_unique' if is_unique else ''}_{run_ts}"
+    jobs = [job for job in (_daily_chart_job(query, str(Path(output_dir) / f"{filename_prefix}_{date_str}{suffix}.png"), date_str, is_unique, instance_id)
+                            for date_str in dates) if job]
+    style = _daily_chart_style(chart_label, is_unique, logo_img, use_color, theme, dpi, tight, instance_id)
+    if pdf_file:
+        chart_files = _render_daily_charts(jobs, *style, pdf_file=pdf_file)
+        print(f"[OK] {len(jobs)} charts saved to {pdf_file}")
+        return chart_files
+    chart_files = _render_chart_batches(_render_daily_charts, jobs, style, max_workers)
+    
+    for output_file in chart_files:
+        print(f"[OK] Chart saved to {output_file}")
+    
+    return chart_files
 
 
-def create_day_of_week_chart(db, output_file, start_date_str=None, end_date_str=None, chart_label='Day of Week - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None):
+def create_day_of_week_chart(query, output_file, start_date_str=None, end_date_str=None, chart_label='Day of Week - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None, dpi=100, tight=False):
     """Create a bar chart showing average attendance by day of week."""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')  # Use non-interactive backend
-    except ImportError:
-        print("WARNING: matplotlib not installed. Install with: pip install matplotlib")
+    plt = _get_plt()
+    if plt is None:
         return
     
-    query = VRCXQuery(db)
     if is_unique:
         summary = query.get_unique_visitors_day_of_week(start_date_str, end_date_str)
     else:
@@ -1776,18 +2228,9 @@ def create_day_of_week_chart(db, output_file, start_date_str=None, end_date_str=
         print("No data to chart")
         return
     
-    # Days of week (Sunday=0 to Saturday=6 in SQLite)
-    days_full = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-    
-    # Extract data - handle both column names
-    day_indices = [row['day_of_week'] for row in summary]
-    day_names = [days_full[idx] for idx in day_indices]
-    
-    # Get the correct column name based on whether it's unique or not
-    if is_unique:
-        avg_people = [row['avg_unique_visitors'] or 0 for row in summary]
-    else:
-        avg_people = [row['avg_unique_people'] or 0 for row in summary]
+    # Extract day names and averages in one pass - handle both column names
+    col = 'avg_unique_visitors' if is_unique else 'avg_unique_people'
+    day_names, avg_people = zip(*((DAY_NAMES[row['day_of_week']], row[col] or 0) for row in summary))
     
     # Create chart
     fig, ax = plt.subplots(figsize=(10, 7))
@@ -1801,10 +2244,9 @@ def create_day_of_week_chart(db, output_file, start_date_str=None, end_date_str=
         bar_color = '#2ca02c'
     
     ax.bar(day_names, avg_people, color=bar_color, width=0.6)
-    ax.set_xlabel('Day of Week', fontsize=12)
-    ax.set_ylabel('Average Unique People', fontsize=12)
-    ax.set_title(f'Average Attendance by Day of Week\n{start_date_str} to {end_date_str or start_date_str}', 
-              fontsize=14, fontweight='bold')
+    ax.set_xlabel('Day of Week')
+    ax.set_ylabel('Average Unique People')
+    ax.set_title(f'Average Attendance by Day of Week\n{start_date_str} to {end_date_str or start_date_str}')
     ax.tick_params(axis='x', rotation=45)
     ax.grid(axis='y', alpha=0.3)
     
@@ -1818,24 +2260,19 @@ def create_day_of_week_chart(db, output_file, start_date_str=None, end_date_str=
         apply_logo_to_figure(fig, logo_img, position='center', alpha=0.5)
     
     plt.subplots_adjust(bottom=0.15)
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    _save_chart(fig, output_file, dpi, tight)
     plt.close()
     
     print(f"[OK] Chart saved to {output_file}")
 
 
-def create_monthly_charts(db, output_dir, start_date_str=None, end_date_str=None, chart_label='Monthly Daily Breakdown - All Visitors', is_unique=False, run_ts=None, logo_img=None, use_color=False, theme=None):
+def create_monthly_charts(query, output_dir, start_date_str=None, end_date_str=None, chart_label='Monthly Daily Breakdown - All Visitors', is_unique=False, run_ts=None, logo_img=None, use_color=False, theme=None, dpi=100, tight=False):
     """Create bar charts for each month showing daily totals."""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')
-    except ImportError:
-        print("WARNING: matplotlib not installed. Install with: pip install matplotlib")
+    plt = _get_plt()
+    if plt is None:
         return []
 
     from pathlib import Path
-    query = VRCXQuery(db)
     if is_unique:
         summary = query.get_unique_visitors_monthly(start_date_str, end_date_str)
         col = 'unique_visitors'
@@ -1854,7 +2291,8 @@ def create_monthly_charts(db, output_dir, start_date_str=None, end_date_str=None
         months.setdefault(month_label, {})[row['day_of_month']] = row[col] or 0
 
     chart_files = []
-    for month_label, days_dict in sorted(months.items()):
+    # Rows are ordered by date, so months are already inserted in order
+    for month_label, days_dict in months.items():
         # Determine number of days in this month
         try:
             month_start = datetime.strptime(f"{month_label}-01", "%Y-%m-%d")
@@ -1877,10 +2315,10 @@ def create_monthly_charts(db, output_dir, start_date_str=None, end_date_str=None
             bar_color = '#4e79a7'
         
         ax.bar(day_numbers, values, color=bar_color, width=0.8)
-        ax.set_xlabel('Day of Month', fontsize=12)
+        ax.set_xlabel('Day of Month')
         ylabel = 'Unique People' if is_unique else 'People'
-        ax.set_ylabel(ylabel, fontsize=12)
-        ax.set_title(f"{chart_label}\n{month_label}", fontsize=14, fontweight='bold')
+        ax.set_ylabel(ylabel)
+        ax.set_title(f"{chart_label}\n{month_label}")
         ax.set_xticks(day_numbers)
         ax.grid(axis='y', alpha=0.3)
 
@@ -1896,7 +2334,7 @@ def create_monthly_charts(db, output_dir, start_date_str=None, end_date_str=None
 
         ts_suffix = f"_{run_ts}" if run_ts else ""
         output_file = Path(output_dir) / f"vrcx_monthly_{month_label}{ts_suffix}.png"
-        plt.savefig(output_file, dpi=150, bbox_inches='tight')
+        _save_chart(fig, output_file, dpi, tight)
         plt.close()
         chart_files.append(str(output_file))
         print(f"[OK] Chart saved to {output_file}")
@@ -1904,135 +2342,262 @@ def create_monthly_charts(db, output_dir, start_date_str=None, end_date_str=None
     return chart_files
 
 
-def create_weekly_charts(db, output_dir, start_date_str=None, end_date_str=None, chart_label='Weekly Breakdown - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None):
-    """Create separate bar charts for each week showing day-of-week attendance."""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')  # Use non-interactive backend
-    except ImportError:
-        print("WARNING: matplotlib not installed. Install with: pip install matplotlib")
-        return []
-    
-    from pathlib import Path
-    query = VRCXQuery(db)
-    if is_unique:
-        summary = query.get_unique_visitors_weekly(start_date_str, end_date_str)
-    else:
-        summary = query.get_weekly_day_of_week_breakdown(start_date_str, end_date_str)
+def _render_week_charts(jobs, chart_label, bar_color, bg_color, info_face, logo_img=None, use_color=False, dpi=100, tight=False):
+    """
+    Render a batch of weekly charts on one reused figure.
     
-    if not summary:
-        print("No data to chart")
+    jobs is a list of (output_file, week_start, week_end, day_names, people).
+    Runs in the caller or in a worker process, so everything it needs is
+    passed in as plain picklable values. Returns the saved file paths.
+    """
+    plt = _get_plt()
+    if plt is None:
         return []
     
-    # Days of week for ordering
-    days_full = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-    
-    # Group data by week
-    weeks = {}
-    for row in summary:
-        week_key = (row['week_start'], row['week_end'])
-        if week_key not in weeks:
-            weeks[week_key] = {}
-        # Get the correct column name (sqlite3.Row doesn't have .get() method)
-        try:
-            people_count = row['unique_visitors']
-        except (KeyError, IndexError):
-            try:
-                people_count = row['unique_people']
-            except (KeyError, IndexError):
-                people_count = 0
-        weeks[week_key][row['day_of_week']] = people_count or 0
+    # One figure is reused for every week: the axes are cleared and redrawn,
+    # while the figure-level info box and margins are set up only once
+    fig, ax = plt.subplots(figsize=(10, 7))
+    fig.text(0.5, 0.02, chart_label, ha='center', fontsize=10,
+             bbox=dict(boxstyle='round', facecolor=info_face, edgecolor='#cccccc', pad=0.5))
+    fig.subplots_adjust(bottom=0.15)
     
-    # Create a chart for each week
     chart_files = []
-    for (week_start, week_end), week_data in sorted(weeks.items()):
-        # Prepare data for this week
-        day_indices = sorted(week_data.keys())
-        day_names = [days_full[idx] for idx in day_indices]
-        people = [week_data[idx] for idx in day_indices]
-        
-        # Create chart
-        fig, ax = plt.subplots(figsize=(10, 7))
-
-        if use_color:
-            bg_color = (theme or {}).get('background', '#f5f5f5')
-            bar_color = (theme or {}).get('primary', '#ff7f0e')
-            apply_chart_background(ax, bg_color)
-        else:
-            bar_color = '#ff7f0e'
+    for output_file, week_start, week_end, day_names, people in jobs:
+        ax.clear()
+        apply_chart_background(ax, bg_color)
 
         ax.bar(day_names, people, color=bar_color, width=0.6)
-        ax.set_xlabel('Day of Week', fontsize=12)
-        ax.set_ylabel('Unique People', fontsize=12)
-        ax.set_title(f'Weekly Attendance: {week_start} to {week_end}', 
-                  fontsize=14, fontweight='bold')
+        ax.set_xlabel('Day of Week')
+        ax.set_ylabel('Unique People')
+        ax.set_title(f'Weekly Attendance: {week_start} to {week_end}')
         ax.tick_params(axis='x', rotation=45)
         ax.grid(axis='y', alpha=0.3)
-        
-        # Add info box at bottom
-        info_face = (theme or {}).get('accent', '#f0f0f0') if use_color else '#f0f0f0'
-        fig.text(0.5, 0.02, chart_label, ha='center', fontsize=10,
-                 bbox=dict(boxstyle='round', facecolor=info_face, edgecolor='#cccccc', pad=0.5))
 
-        # Apply logo if provided
+        # Apply logo if provided (it lives on the axes, so re-add after clear)
         if logo_img and use_color:
             apply_logo_to_figure(fig, logo_img, position='center', alpha=0.5)
         
-        plt.subplots_adjust(bottom=0.15)
+        _save_chart(fig, output_file, dpi, tight)
+        chart_files.append(output_file)
+    
+    plt.close(fig)
+    return chart_files
+
+
+def _nice_ticks(max_value, target=6):
+    """Return evenly spaced 1/2/5 x 10^n axis ticks from 0 covering max_value."""
+    import math
+    
+    if max_value <= 0:
+        return [0, 1]
+    raw = max_value / target
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    count = math.ceil(max_value / step)
+    return [i * step for i in range(count + 1)]
+
+
+def _render_week_charts_pillow(jobs, chart_label, bar_color, bg_color, info_face, logo_img=None, use_color=False, dpi=100, tight=False):
+    """
+    Pillow counterpart of _render_week_charts for --chart-engine pillow.
+    
+    Draws the same 10x7in layout (title, gridlines, bars, axis labels and
+    info box) straight onto an image, skipping matplotlib's import and
+    figure machinery. tight is accepted for signature parity; the canvas
+    is always the full figure size. Needs Pillow 10.1+ with FreeType for
+    the scalable default font (checked by create_weekly_charts).
+    """
+    from PIL import Image, ImageDraw, ImageFont
+    
+    # Font sizes in pixels, from matplotlib's point sizes at this dpi
+    title_px, label_px, tick_px, info_px = (points * dpi / 72 for points in (14, 12, 10, 10))
+    title_font, label_font, tick_font, info_font = (ImageFont.load_default(size=px) for px in (title_px, label_px, tick_px, info_px))
+    width, height = int(10 * dpi), int(7 * dpi)
+    # Axes box matches matplotlib's default margins with bottom=0.15
+    left, right = int(width * 0.125), int(width * 0.9)
+    top, bottom = int(height * 0.12), int(height * 0.85)
+    
+    chart_files = []
+    for output_file, week_start, week_end, day_names, people in jobs:
+        img = Image.new('RGB', (width, height), 'white')
+        draw = ImageDraw.Draw(img)
+        draw.rectangle([left, top, right, bottom], fill=bg_color or 'white')
+        
+        ticks = _nice_ticks(max(people, default=0))
+        scale = (bottom - top) / ticks[-1]
+        for tick in ticks:
+            y = bottom - tick * scale
+            draw.line([left, y, right, y], fill='#e6e6e6')
+            draw.text((left - 6, y), f"{tick:g}", font=tick_font, fill='black', anchor='rm')
+        
+        slot = (right - left) / max(len(day_names), 1)
+        for i, (day_name, value) in enumerate(zip(day_names, people)):
+            center = left + slot * (i + 0.5)
+            draw.rectangle([center - slot * 0.3, bottom - value * scale, center + slot * 0.3, bottom], fill=bar_color)
+            draw.text((center, bottom + 6), day_name, font=tick_font, fill='black', anchor='ma')
+        draw.rectangle([left, top, right, bottom], outline='black')
+        
+        draw.text(((left + right) / 2, top - 10), f'Weekly Attendance: {week_start} to {week_end}',
+                  font=title_font, fill='black', anchor='md')
+        draw.text(((left + right) / 2, bottom + 12 + tick_px * 1.5), 'Day of Week',
+                  font=label_font, fill='black', anchor='ma')
+        
+        # Rotated y-axis label
+        y_label = Image.new('RGBA', (bottom - top, int(label_px * 1.6)), (0, 0, 0, 0))
+        ImageDraw.Draw(y_label).text((y_label.width / 2, y_label.height / 2), 'Unique People',
+                                     font=label_font, fill='black', anchor='mm')
+        y_label = y_label.rotate(90, expand=True)
+        img.paste(y_label, (int(left * 0.25), top), y_label)
+        
+        # Info box at bottom
+        box = draw.textbbox((width / 2, height * 0.98), chart_label, font=info_font, anchor='md')
+        pad = info_px * 0.5
+        draw.rounded_rectangle([box[0] - pad, box[1] - pad, box[2] + pad, box[3] + pad],
+                               radius=pad, fill=info_face, outline='#cccccc')
+        draw.text((width / 2, height * 0.98), chart_label, font=info_font, fill='black', anchor='md')
         
-        # Save chart
-        output_file = Path(output_dir) / f"vrcx_week_{week_start}_to_{week_end}.png"
-        plt.savefig(output_file, dpi=150, bbox_inches='tight')
-        plt.close()
+        if logo_img and use_color:
+            # Scale to 80% of the axes, like apply_logo_to_figure
+            logo = logo_img.convert('RGBA')
+            ratio = min((right - left) * 0.8 / logo.width, (bottom - top) * 0.8 / logo.height)
+            logo = logo.resize((int(logo.width * ratio), int(logo.height * ratio)))
+            alpha = logo.getchannel('A').point(lambda a: a // 2)
+            img.paste(logo, ((left + right - logo.width) // 2, (top + bottom - logo.height) // 2), alpha)
         
-        chart_files.append(str(output_file))
-        print(f"[OK] Chart saved to {output_file}")
+        _write_atomically(output_file, lambda path: img.save(path, dpi=(dpi, dpi)))
+        chart_files.append(output_file)
     
     return chart_files
 
 
-def create_combined_weekly_chart(db, output_file, start_date_str=None, end_date_str=None, chart_label='Weekly Breakdown - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None):
-    """Create a single combined chart with all weeks as subplots."""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')  # Use non-interactive backend
-    except ImportError:
-        print("WARNING: matplotlib not installed. Install with: pip install matplotlib")
-        return
+# Below this many charts per worker, start-up costs more than rendering inline
+PARALLEL_CHART_MIN_CHARTS = 8
+
+
+def _render_chart_batches(render, jobs, style, max_workers=None):
+    """
+    Run render(jobs, *style), split into contiguous batches on worker processes.
     
-    from pathlib import Path
-    import math
+    matplotlib is not thread-safe, so long job lists are divided across
+    processes (default: CPU count); short ones, or a failed pool, render
+    in-process. Returns the saved file paths in job order.
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs) // PARALLEL_CHART_MIN_CHARTS)
+    if workers > 1:
+        size = -(-len(jobs) // workers)
+        batches = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+        try:
+            with ProcessPoolExecutor(max_workers=len(batches)) as pool:
+                results = list(pool.map(render, batches, *[[value] * len(batches) for value in style]))
+            return [path for batch in results for path in batch]
+        except Exception as e:
+            print(f"WARNING: Parallel chart rendering failed, rendering in-process: {e}")
+    return render(jobs, *style)
+
+
+def _weekly_chart_weeks(query, start_date_str=None, end_date_str=None, is_unique=False):
+    """
+    Fetch the weekly breakdown and shape it for the weekly charts.
     
-    query = VRCXQuery(db)
+    Returns:
+        List of ((week_start, week_end), day_names, people) in week order.
+    """
     if is_unique:
         summary = query.get_unique_visitors_weekly(start_date_str, end_date_str)
+        col = 'unique_visitors'
     else:
         summary = query.get_weekly_day_of_week_breakdown(start_date_str, end_date_str)
+        col = 'unique_people'
     
-    if not summary:
-        print("No data to chart")
-        return
+    # Rows within a week arrive ordered by day_of_week
+    return [(week_key, [DAY_NAMES[row['day_of_week']] for row in week_rows], [row[col] or 0 for row in week_rows])
+            for week_key, week_rows in _group_weeks(summary)]
+
+
+def create_weekly_outputs(query, output_dir, combined_file, start_date_str=None, end_date_str=None, chart_label='Weekly Breakdown - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None, dpi=100, tight=False, engine='matplotlib', max_workers=None):
+    """
+    Create the per-week charts and the combined weekly chart from one fetch.
     
-    # Days of week for ordering
-    days_full = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+    Returns:
+        List of per-week chart paths.
+    """
+    weeks = _weekly_chart_weeks(query, start_date_str, end_date_str, is_unique)
+    chart_files = create_weekly_charts(query, output_dir, start_date_str, end_date_str, chart_label, is_unique, logo_img, use_color, theme,
+                                       dpi=dpi, tight=tight, max_workers=max_workers, engine=engine, weeks=weeks)
+    print(f"[OK] Created {len(chart_files)} individual weekly charts")
+    create_combined_weekly_chart(query, combined_file, start_date_str, end_date_str, chart_label, is_unique, logo_img, use_color, theme,
+                                 dpi=dpi, tight=tight, weeks=weeks)
+    return chart_files
+
+
+def create_weekly_charts(query, output_dir, start_date_str=None, end_date_str=None, chart_label='Weekly Breakdown - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None, dpi=100, tight=False, max_workers=None, engine='matplotlib', weeks=None):
+    """
+    Create separate bar charts for each week showing day-of-week attendance.
     
-    # Group data by week
-    weeks = {}
-    for row in summary:
-        week_key = (row['week_start'], row['week_end'])
-        if week_key not in weeks:
-            weeks[week_key] = {}
-        # Get the correct column name (sqlite3.Row doesn't have .get() method)
+    Long ranges are split into contiguous batches of weeks rendered in
+    parallel worker processes (matplotlib is not thread-safe); each batch
+    reuses a single figure. engine='pillow' draws the charts with Pillow
+    instead and never imports matplotlib. Pass weeks from
+    _weekly_chart_weeks() to skip fetching them again.
+    """
+    render = _render_week_charts
+    if engine == 'pillow':
         try:
-            people_count = row['unique_visitors']
-        except (KeyError, IndexError):
+            from PIL import ImageFont
+        except ImportError:
+            print("WARNING: Pillow not installed, using matplotlib. Install with: pip install Pillow")
+        else:
             try:
-                people_count = row['unique_people']
-            except (KeyError, IndexError):
-                people_count = 0
-        weeks[week_key][row['day_of_week']] = people_count or 0
+                # The renderer's scalable default font needs FreeType and Pillow 10.1+
+                ImageFont.load_default(size=10)
+                render = _render_week_charts_pillow
+            except (TypeError, OSError, ImportError):
+                print("WARNING: Pillow lacks FreeType or is older than 10.1, using matplotlib")
+    if render is _render_week_charts and _get_plt() is None:
+        return []
+    
+    from pathlib import Path
+    if weeks is None:
+        weeks = _weekly_chart_weeks(query, start_date_str, end_date_str, is_unique)
+    
+    if not weeks:
+        print("No data to chart")
+        return []
+    
+    # One render job per week
+    jobs = [(str(Path(output_dir) / f"vrcx_week_{week_start}_to_{week_end}.png"), week_start, week_end, day_names, people)
+            for (week_start, week_end), day_names, people in weeks]
+    
+    if use_color:
+        bg_color = (theme or {}).get('background', '#f5f5f5')
+        bar_color = (theme or {}).get('primary', '#ff7f0e')
+        info_face = (theme or {}).get('accent', '#f0f0f0')
+    else:
+        bg_color, bar_color, info_face = None, '#ff7f0e', '#f0f0f0'
+    style = (chart_label, bar_color, bg_color, info_face, logo_img, use_color, dpi, tight)
+    chart_files = _render_chart_batches(render, jobs, style, max_workers)
+    
+    for output_file in chart_files:
+        print(f"[OK] Chart saved to {output_file}")
+    
+    return chart_files
+
+
+def create_combined_weekly_chart(query, output_file, start_date_str=None, end_date_str=None, chart_label='Weekly Breakdown - All Visitors', is_unique=False, logo_img=None, use_color=False, theme=None, dpi=100, tight=False, weeks=None):
+    """Create a single combined chart with all weeks as subplots (weeks as in create_weekly_charts)."""
+    plt = _get_plt()
+    if plt is None:
+        return
+    
+    from pathlib import Path
+    import math
+    
+    if weeks is None:
+        weeks = _weekly_chart_weeks(query, start_date_str, end_date_str, is_unique)
+    
+    if not weeks:
+        print("No data to chart")
+        return
     
     num_weeks = len(weeks)
     if num_weeks == 0:
@@ -2044,23 +2609,13 @@ def create_combined_weekly_chart(db, output_file, start_date_str=None, end_date_
     rows = math.ceil(num_weeks / cols)
     
     # Create figure with subplots (reserve space for info box at bottom)
-    fig, axes = plt.subplots(rows, cols, figsize=(15, 5 * rows + 0.8))
-    
-    # Flatten axes array for easier iteration
-    if num_weeks == 1:
-        axes = [axes]
-    else:
-        axes = axes.flatten() if rows > 1 else [axes] if cols == 1 else axes
+    fig, axes = plt.subplots(rows, cols, figsize=(15, 5 * rows + 0.8), squeeze=False)
+    axes = axes.ravel()
     
     # Plot each week in a subplot
-    for idx, ((week_start, week_end), week_data) in enumerate(sorted(weeks.items())):
+    for idx, ((week_start, week_end), day_names, people) in enumerate(weeks):
         ax = axes[idx]
         
-        # Prepare data for this week
-        day_indices = sorted(week_data.keys())
-        day_names = [days_full[i] for i in day_indices]
-        people = [week_data[i] for i in day_indices]
-        
         # Create bar chart
         if use_color:
             bg_color = (theme or {}).get('background', '#f5f5f5')
@@ -2070,7 +2625,7 @@ def create_combined_weekly_chart(db, output_file, start_date_str=None, end_date_
             bar_color = '#ff7f0e'
 
         ax.bar(day_names, people, color=bar_color, width=0.6)
-        ax.set_title(f'{week_start} to {week_end}', fontsize=12, fontweight='bold')
+        ax.set_title(f'{week_start} to {week_end}', fontsize=12)
         ax.set_xlabel('Day of Week', fontsize=10)
         ax.set_ylabel('Unique People', fontsize=10)
         ax.tick_params(axis='x', rotation=45)
@@ -2094,146 +2649,84 @@ def create_combined_weekly_chart(db, output_file, start_date_str=None, end_date_
         apply_logo_to_figure(fig, logo_img, position='center', alpha=0.5)
     
     plt.subplots_adjust(bottom=0.08)
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    _save_chart(fig, output_file, dpi, tight)
     plt.close()
     
     print(f"[OK] Combined chart saved to {output_file}")
 
 
-def export_to_csv(db, output_file, date_str=None, start_date_str=None, end_date_str=None, is_average=False, is_daily=False, is_day_of_week=False, is_weekly=False, is_monthly=False, is_unique=False):
-    """Export hour-by-hour data to CSV file."""
+def _export_rows(query, date_str=None, start_date_str=None, end_date_str=None, is_average=False, is_daily=False, is_day_of_week=False, is_weekly=False, is_monthly=False, is_unique=False):
+    """
+    Fetch and format the rows shared by the CSV and Excel exporters.
+    
+    Returns:
+        Tuple of (headers, rows, column_widths, centered_columns). Rows are
+        plain lists ready to write; centered_columns are 1-based indexes of
+        the numeric columns.
+    """
+    count_key = 'unique_visitors' if is_unique else 'unique_people'
+    avg_key = 'avg_unique_visitors' if is_unique else 'avg_unique_people'
+    label = 'Unique Visitors' if is_unique else 'People'
+    
+    if is_weekly:
+        fetch = query.get_unique_visitors_weekly if is_unique else query.get_weekly_day_of_week_breakdown
+        summary = fetch(start_date_str, end_date_str)
+        headers = ['Week Start', 'Week End', 'Day of Week', label]
+        rows = [[row['week_start'], row['week_end'], DAY_NAMES[row['day_of_week']], row[count_key] or 0] for row in summary]
+        return headers, rows, [12, 12, 15, 12], (4,)
+    if is_monthly:
+        fetch = query.get_unique_visitors_monthly if is_unique else query.get_monthly_daily_breakdown
+        summary = fetch(start_date_str, end_date_str)
+        headers = ['Month', 'Date', label]
+        rows = [[row['month_label'], row['date'], row[count_key] or 0] for row in summary]
+        return headers, rows, [10, 12, 15], (3,)
+    if is_day_of_week:
+        fetch = query.get_unique_visitors_day_of_week if is_unique else query.get_day_of_week_average
+        summary = fetch(start_date_str, end_date_str)
+        headers = ['Day of Week', f'Avg {label}']
+        rows = [[DAY_NAMES[row['day_of_week']], row[avg_key] or 0] for row in summary]
+        return headers, rows, [15, 15], (2,)
+    if is_average:
+        fetch = query.get_unique_visitors_average if is_unique else query.get_hour_by_hour_average
+        summary = fetch(start_date_str, end_date_str)
+        headers = ['Hour', f'Avg {label}']
+        rows = [[HOUR_LABELS[row['hour']], row[avg_key] or 0] for row in summary]
+        return headers, rows, [10, 15], (2,)
+    if is_daily:
+        if is_unique:
+            summary = query.get_unique_visitors_daily(start_date_str, end_date_str)
+            headers = ['Date', label]
+            rows = [[row['date'], row[count_key] or 0] for row in summary]
+            return headers, rows, [12, 10], (2,)
+        summary = query.get_daily_hourly_summary(start_date_str, end_date_str)
+        headers = ['Date', 'Hour', label]
+        rows = [[date, HOUR_LABELS[hour], people or 0] for date, hour, people in summary]
+        return headers, rows, [12, 10, 12], (2, 3)
+    
+    fetch = query.get_unique_visitors_by_hour if is_unique else query.get_hour_by_hour_summary
+    summary = fetch(date_str)
+    headers = ['Hour', label]
+    rows = [[HOUR_LABELS[row['hour']], row[count_key] or 0] for row in summary]
+    return headers, rows, [10, 15], (2,)
+
+
+def _write_csv(output_file, headers, rows):
+    """Write preformatted export rows to a CSV file."""
     try:
         import csv
     except ImportError:
         print("ERROR: csv module not available")
         return
     
-    query = VRCXQuery(db)
-    
-    if is_unique:
-        if is_weekly:
-            summary = query.get_unique_visitors_weekly(start_date_str, end_date_str)
-            fieldnames = ['Week Start', 'Week End', 'Day of Week', 'Unique Visitors']
-        elif is_monthly:
-            summary = query.get_unique_visitors_monthly(start_date_str, end_date_str)
-            fieldnames = ['Month', 'Date', 'Unique Visitors']
-        elif is_day_of_week:
-            summary = query.get_unique_visitors_day_of_week(start_date_str, end_date_str)
-            fieldnames = ['Day of Week', 'Avg Unique Visitors']
-            days = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        elif is_average:
-            summary = query.get_unique_visitors_average(start_date_str, end_date_str)
-            fieldnames = ['Hour', 'Avg Unique Visitors']
-        elif is_daily:
-            summary = query.get_unique_visitors_daily(start_date_str, end_date_str)
-            fieldnames = ['Date', 'Unique Visitors']
-        else:
-            summary = query.get_unique_visitors_by_hour(date_str)
-            fieldnames = ['Hour', 'Unique Visitors']
-    else:
-        if is_weekly:
-            summary = query.get_weekly_day_of_week_breakdown(start_date_str, end_date_str)
-            fieldnames = ['Week Start', 'Week End', 'Day of Week', 'People']
-        elif is_monthly:
-            summary = query.get_monthly_daily_breakdown(start_date_str, end_date_str)
-            fieldnames = ['Month', 'Date', 'People']
-        elif is_day_of_week:
-            summary = query.get_day_of_week_average(start_date_str, end_date_str)
-            fieldnames = ['Day of Week', 'Avg People']
-            days = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        elif is_average:
-            summary = query.get_hour_by_hour_average(start_date_str, end_date_str)
-            fieldnames = ['Hour', 'Avg People']
-        elif is_daily:
-            summary = query.get_daily_hourly_summary(start_date_str, end_date_str)
-            fieldnames = ['Date', 'Hour', 'People']
-        else:
-            summary = query.get_hour_by_hour_summary(date_str)
-            fieldnames = ['Hour', 'People']
-    
-    if not summary:
-        print("No data to export")
-        return
-    
     with open(output_file, 'w', newline='') as f:
         writer = csv.writer(f)
-        writer.writerow(fieldnames)
-        
-        for row in summary:
-            if is_unique:
-                if is_weekly:
-                    writer.writerow([
-                        row['week_start'],
-                        row['week_end'],
-                        row['day_name'],
-                        row['unique_visitors'] or 0
-                    ])
-                elif is_monthly:
-                    writer.writerow([
-                        row['month_label'],
-                        row['date'],
-                        row['unique_visitors'] or 0
-                    ])
-                elif is_day_of_week:
-                    writer.writerow([
-                        days[row['day_of_week']],
-                        row['avg_unique_visitors'] or 0
-                    ])
-                elif is_average:
-                    writer.writerow([
-                        f"{row['hour']:02d}:00",
-                        row['avg_unique_visitors'] or 0
-                    ])
-                elif is_daily:
-                    writer.writerow([
-                        row['date'],
-                        row['unique_visitors'] or 0
-                    ])
-                else:
-                    writer.writerow([
-                        f"{row['hour']:02d}:00",
-                        row['unique_visitors'] or 0
-                    ])
-            else:
-                if is_weekly:
-                    writer.writerow([
-                        row['week_start'],
-                        row['week_end'],
-                        row['day_name'],
-                        row['unique_people'] or 0
-                    ])
-                elif is_monthly:
-                    writer.writerow([
-                        row['month_label'],
-                        row['date'],
-                        row['unique_people'] or 0
-                    ])
-                elif is_day_of_week:
-                    writer.writerow([
-                        days[row['day_of_week']],
-                        row['avg_unique_people'] or 0
-                    ])
-                elif is_average:
-                    writer.writerow([
-                        f"{row['hour']:02d}:00",
-                        row['avg_unique_people'] or 0
-                    ])
-                elif is_daily:
-                    writer.writerow([
-                        row['date'],
-                        f"{row['hour']:02d}:00",
-                        row['unique_people'] or 0
-                    ])
-                else:
-                    writer.writerow([
-                        f"{row['hour']:02d}:00",
-                        row['unique_people'] or 0
-                    ])
+        writer.writerow(headers)
+        writer.writerows(rows)
     
     print(f"[OK] Exported to {output_file}")
 
 
-def export_to_csv_for_instance(db, output_file, instance_id, date_str=None, is_unique=False):
+def export_to_csv_for_instance(query, output_file, instance_id, date_str=None, is_unique=False):
     """Export hour-by-hour data for a specific instance to CSV file."""
     try:
         import csv
@@ -2241,17 +2734,18 @@ def export_to_csv_for_instance(db, output_file, instance_id, date_str=None, is_u
         print("ERROR: csv module not available")
         return
     
-    query = VRCXQuery(db)
     
     if date_str is None:
-        date_str = datetime.now().strftime('%Y-%m-%d')
+        date_str = query.today
     
     if is_unique:
         summary = query.get_unique_visitors_by_hour_for_instance(instance_id, date_str)
         fieldnames = ['Hour', 'Unique Visitors']
+        count_key = 'unique_visitors'
     else:
         summary = query.get_hour_by_hour_summary_for_instance(instance_id, date_str)
         fieldnames = ['Hour', 'People']
+        count_key = 'unique_people'
     
     if not summary:
         print("No data to export")
@@ -2259,221 +2753,124 @@ def export_to_csv_for_instance(db, output_file, instance_id, date_str=None, is_u
     
     with open(output_file, 'w', newline='') as f:
         writer = csv.writer(f)
-        # Write instance ID as first row for context
-        writer.writerow(['Instance ID', instance_id])
-        writer.writerow(['Date', date_str])
-        writer.writerow([])  # Blank row for separation
-        writer.writerow(fieldnames)
-        
-        for row in summary:
-            if is_unique:
-                writer.writerow([
-                    f"{row['hour']:02d}:00",
-                    row['unique_visitors'] or 0
-                ])
-            else:
-                writer.writerow([
-                    f"{row['hour']:02d}:00",
-                    row['unique_people'] or 0
-                ])
+        # Instance ID and date first for context, then a blank separator row
+        writer.writerows([['Instance ID', instance_id], ['Date', date_str], [], fieldnames])
+        writer.writerows((HOUR_LABELS[row['hour']], row[count_key] or 0) for row in summary)
     
     print(f"[OK] Exported to {output_file}")
 
 
-def export_to_excel(db, output_file, date_str=None, start_date_str=None, end_date_str=None, is_average=False, is_daily=False, is_day_of_week=False, is_weekly=False, is_monthly=False, is_unique=False):
-    """Export hour-by-hour data to Excel file."""
+def _write_excel(output_file, headers, rows, widths, centered):
+    """Write preformatted export rows to a styled Excel sheet."""
     try:
         import openpyxl
-        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+        from openpyxl.utils import get_column_letter
     except ImportError:
         print("WARNING: openpyxl not installed. Install with: pip install openpyxl")
         return
     
-    query = VRCXQuery(db)
+    # Write-only workbook streams rows to disk
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Hour-by-Hour")
+    
+    # Styles are registered once; cells only reference them by name
+    wb.add_named_style(NamedStyle(
+        name='vrcx_header',
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+        alignment=Alignment(horizontal="center", vertical="center")))
+    wb.add_named_style(NamedStyle(name='vrcx_centered', alignment=Alignment(horizontal="center")))
+    
+    # Column widths must be set before the first row is written
+    for idx, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(idx)].width = width
+    
+    header_row = []
+    for value in headers:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = 'vrcx_header'
+        header_row.append(cell)
+    ws.append(header_row)
+    
+    # Copy each row before swapping in styled cells so the caller's rows stay plain
+    for row in rows:
+        row = list(row)
+        for col in centered:
+            cell = WriteOnlyCell(ws, value=row[col - 1])
+            cell.style = 'vrcx_centered'
+            row[col - 1] = cell
+        ws.append(row)
     
-    if is_unique:
-        if is_weekly:
-            summary = query.get_unique_visitors_weekly(start_date_str, end_date_str)
-            headers = ['Week Start', 'Week End', 'Day of Week', 'Unique Visitors']
-        elif is_monthly:
-            summary = query.get_unique_visitors_monthly(start_date_str, end_date_str)
-            headers = ['Month', 'Date', 'Unique Visitors']
-        elif is_day_of_week:
-            summary = query.get_unique_visitors_day_of_week(start_date_str, end_date_str)
-            headers = ['Day of Week', 'Avg Unique Visitors']
-            days = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        elif is_average:
-            summary = query.get_unique_visitors_average(start_date_str, end_date_str)
-            headers = ['Hour', 'Avg Unique Visitors']
-        elif is_daily:
-            summary = query.get_unique_visitors_daily(start_date_str, end_date_str)
-            headers = ['Date', 'Unique Visitors']
-        else:
-            summary = query.get_unique_visitors_by_hour(date_str)
-            headers = ['Hour', 'Unique Visitors']
-    else:
-        if is_weekly:
-            summary = query.get_weekly_day_of_week_breakdown(start_date_str, end_date_str)
-            headers = ['Week Start', 'Week End', 'Day of Week', 'People']
-        elif is_monthly:
-            summary = query.get_monthly_daily_breakdown(start_date_str, end_date_str)
-            headers = ['Month', 'Date', 'People']
-        elif is_day_of_week:
-            summary = query.get_day_of_week_average(start_date_str, end_date_str)
-            headers = ['Day of Week', 'Avg People']
-            days = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        elif is_average:
-            summary = query.get_hour_by_hour_average(start_date_str, end_date_str)
-            headers = ['Hour', 'Avg People']
-        elif is_daily:
-            summary = query.get_daily_hourly_summary(start_date_str, end_date_str)
-            headers = ['Date', 'Hour', 'People']
-        else:
-            summary = query.get_hour_by_hour_summary(date_str)
-            headers = ['Hour', 'People']
+    wb.save(output_file)
+    print(f"[OK] Exported to {output_file}")
+
+
+def export_data(query, csv_file, xlsx_file, date_str=None, start_date_str=None, end_date_str=None, is_average=False, is_daily=False, is_day_of_week=False, is_weekly=False, is_monthly=False, is_unique=False):
+    """Export one report to both CSV and Excel, fetching and formatting it once."""
+    headers, rows, widths, centered = _export_rows(query, date_str, start_date_str, end_date_str, is_average, is_daily,
+                                                   is_day_of_week, is_weekly, is_monthly, is_unique)
     
-    if not summary:
+    if not rows:
         print("No data to export")
         return
     
-    # Create workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Hour-by-Hour"
+    _write_csv(csv_file, headers, rows)
+    _write_excel(xlsx_file, headers, rows, widths, centered)
+
+
+def serve_date_queries(query, is_unique=False, stream_in=None, stream_out=None):
+    """
+    Answer hourly report requests from one long-lived process.
     
-    # Add headers
-    ws.append(headers)
+    Reads one date (YYYY-MM-DD) per line and writes that day's hour-by-hour
+    CSV followed by a blank line. The connection, compiled statements and
+    query cache stay warm across requests, so a batch of dates pays the
+    interpreter and database start-up cost once. Stops at EOF or 'quit'.
     
-    # Style headers
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF")
+    Args:
+        query: VRCXQuery for the connected database
+        is_unique: Report unique visitors instead of all join/leave events
+        stream_in: Line source (default: stdin)
+        stream_out: CSV destination (default: stdout)
+    """
+    import csv
     
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+    stream_in = stream_in or sys.stdin
+    stream_out = stream_out or sys.stdout
+    writer = csv.writer(stream_out, lineterminator='\n')
     
-    # Add data rows
-    for row in summary:
-        if is_unique:
-            if is_weekly:
-                ws.append([
-                    row['week_start'],
-                    row['week_end'],
-                    row['day_name'],
-                    row['unique_visitors'] or 0
-                ])
-            elif is_monthly:
-                ws.append([
-                    row['month_label'],
-                    row['date'],
-                    row['unique_visitors'] or 0
-                ])
-            elif is_day_of_week:
-                ws.append([
-                    days[row['day_of_week']],
-                    row['avg_unique_visitors'] or 0
-                ])
-            elif is_average:
-                ws.append([
-                    f"{row['hour']:02d}:00",
-                    row['avg_unique_visitors'] or 0
-                ])
-            elif is_daily:
-                ws.append([
-                    row['date'],
-                    row['unique_visitors'] or 0
-                ])
-            else:
-                ws.append([
-                    f"{row['hour']:02d}:00",
-                    row['unique_visitors'] or 0
-                ])
+    for line in stream_in:
+        date_str = line.strip()
+        if not date_str:
+            continue
+        if date_str.lower() in ('quit', 'exit'):
+            break
+        
+        try:
+            datetime.strptime(date_str, '%Y-%m-%d')
+        except ValueError:
+            writer.writerow(['Error', f'Invalid date: {date_str}'])
         else:
-            if is_weekly:
-                ws.append([
-                    row['week_start'],
-                    row['week_end'],
-                    row['day_name'],
-                    row['unique_people'] or 0
-                ])
-            elif is_monthly:
-                ws.append([
-                    row['month_label'],
-                    row['date'],
-                    row['unique_people'] or 0
-                ])
-            elif is_day_of_week:
-                ws.append([
-                    days[row['day_of_week']],
-                    row['avg_unique_people'] or 0
-                ])
-            elif is_average:
-                ws.append([
-                    f"{row['hour']:02d}:00",
-                    row['avg_unique_people'] or 0
-                ])
-            elif is_daily:
-                ws.append([
-                    row['date'],
-                    f"{row['hour']:02d}:00",
-                    row['unique_people'] or 0
-                ])
+            # Today's hours are still filling in; never answer from the cache
+            cache = query.db.query_cache
+            if date_str == query.today and cache:
+                for key in [key for key in cache if date_str in key[1]]:
+                    del cache[key]
+            
+            if is_unique:
+                summary = query.get_unique_visitors_by_hour(date_str)
+                col, label = 'unique_visitors', 'Unique Visitors'
             else:
-                ws.append([
-                    f"{row['hour']:02d}:00",
-                    row['unique_people'] or 0
-                ])
-    
-    # Adjust column widths
-    if is_weekly:
-        ws.column_dimensions['A'].width = 12
-        ws.column_dimensions['B'].width = 12
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 12
-        # Center align numeric columns
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=4, max_col=4):
-            for cell in row:
-                cell.alignment = Alignment(horizontal="center")
-    elif is_monthly:
-        ws.column_dimensions['A'].width = 10
-        ws.column_dimensions['B'].width = 12
-        ws.column_dimensions['C'].width = 15
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=3, max_col=3):
-            for cell in row:
-                cell.alignment = Alignment(horizontal="center")
-    elif is_day_of_week:
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 15
-        # Center align numeric columns
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=2, max_col=2):
-            for cell in row:
-                cell.alignment = Alignment(horizontal="center")
-    elif is_average:
-        ws.column_dimensions['A'].width = 10
-        ws.column_dimensions['B'].width = 15
-        # Center align numeric columns
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=2, max_col=2):
-            for cell in row:
-                cell.alignment = Alignment(horizontal="center")
-    elif is_daily:
-        ws.column_dimensions['A'].width = 12
-        ws.column_dimensions['B'].width = 10
-        ws.column_dimensions['C'].width = 12
-        # Center align numeric columns
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=2, max_col=3):
-            for cell in row:
-                cell.alignment = Alignment(horizontal="center")
-    else:
-        ws.column_dimensions['A'].width = 10
-        ws.column_dimensions['B'].width = 15
-        # Center align numeric columns
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=2, max_col=2):
-            for cell in row:
-                cell.alignment = Alignment(horizontal="center")
-    
-    wb.save(output_file)
-    print(f"[OK] Exported to {output_file}")
+                summary = query.get_hour_by_hour_summary(date_str)
+                col, label = 'unique_people', 'People'
+            
+            writer.writerow(['Date', 'Hour', label])
+            writer.writerows([date_str, HOUR_LABELS[row['hour']], row[col] or 0] for row in summary)
+        
+        stream_out.write('\n')
+        stream_out.flush()
 
 
 # ==============================================================================
@@ -2494,13 +2891,37 @@ Modes (choose by flags):
     * --world-id                       Hourly for a specific world (single date or range)
     * --list-worlds                    List worlds visited in range
     * --list-instances                 List instances for a world in range (requires --world-id)
+    * --serve                          Read dates from stdin, write hourly CSV for each (long-lived)
 
 Common flags:
     * --unique         Count unique visitors (not total joins)
     * --export-data    Also write CSV/XLSX alongside charts
+    * --no-charts      Skip chart generation (and the matplotlib import)
     * --verbose        Print table info
+    * --create-indexes Add report indexes to the VRCX database (one-time, writes)
+    * --rollup-cache   Answer --unique reports from an hourly rollup file
+    * --no-cache       Re-run every report query instead of reusing results
+    * --immutable      Lock-free read-only open (VRCX must be closed)
+    * --chart-dpi N    Chart PNG resolution (default 100)
+    * --tight-charts   Crop chart margins (slower two-pass save)
+    * --chart-engine   Per-week chart renderer: matplotlib (default) or pillow (fast)
+    * --chart-workers  Processes for per-day/per-week charts (default: CPU count; 1 = in-process)
+    * --chart-pdf      Write date-range daily charts as one multi-page PDF
 """
 
+    # Merge themes from file/env before CLI parsing. This runs here rather
+    # than at import so chart worker processes, which re-import the module
+    # under the spawn start method, skip it. The messages are held until
+    # --serve has had a chance to move status output to stderr.
+    with contextlib.redirect_stdout(io.StringIO()) as theme_log:
+        THEMES.update(load_custom_themes())
+        
+        # Optional default theme from environment
+        default_theme = os.getenv('VRCX_THEME')
+        if default_theme and default_theme not in THEMES:
+            print(f"WARNING: VRCX_THEME '{default_theme}' not found among available themes; ignoring")
+            default_theme = None
+
     theme_choices = sorted(THEMES.keys())
 
     parser = argparse.ArgumentParser(
@@ -2516,16 +2937,42 @@ Common flags:
     parser.add_argument('--monthly', type=str, nargs='?', const='current', help='Show daily totals grouped by month. Optionally specify month as YYYY-MM (e.g., 2025-12). If no month given, defaults to current month')
     parser.add_argument('--unique', action='store_true', help='Count unique visitors only once per day (ignores join/leave counts)')
     parser.add_argument('--export-data', action='store_true', help='Export data to CSV and Excel files')
+    parser.add_argument('--no-charts', action='store_true', help='Skip chart generation (console report only, or data files with --export-data)')
     parser.add_argument('--verbose', action='store_true', help='Show verbose output including database table information')
+    parser.add_argument('--create-indexes', action='store_true', help='Create indexes on the VRCX database to speed up reports (writes to the database)')
+    parser.add_argument('--immutable', action='store_true', help='Open the database read-only without locking or WAL checks; only use while VRCX is closed (not with --create-indexes)')
+    parser.add_argument('--no-cache', action='store_true', help='Disable reuse of query results between the console, chart and export steps')
+    parser.add_argument('--rollup-cache', action='store_true', help='Maintain an hourly unique-visitor rollup next to the reports (VRCX_ROLLUP_PATH) and use it for --unique queries')
+    parser.add_argument('--serve', action='store_true', help='Keep running and answer one date (YYYY-MM-DD) per stdin line with its hourly CSV on stdout')
     parser.add_argument('--list-worlds', action='store_true', help='List all worlds visited during the date range')
     parser.add_argument('--world-id', type=str, help='Filter reports to a specific world ID')
     parser.add_argument('--world-name', type=str, help='Optional display name for the world in reports')
     parser.add_argument('--list-instances', action='store_true', help='List all instances for a specific world (requires --world-id)')
     parser.add_argument('--instance-id', '--instance', type=str, dest='instance_id', help='Filter reports to a specific instance (full instance ID from location field)')
     parser.add_argument('--colour', '--color', action='store_true', dest='use_color', help='Add color and styling to charts')
-    parser.add_argument('--theme', choices=theme_choices, default=DEFAULT_THEME_NAME, help='Apply a named colour theme (implies --colour)')
+    parser.add_argument('--theme', choices=theme_choices, default=default_theme, help='Apply a named colour theme (implies --colour)')
+    parser.add_argument('--chart-dpi', type=int, default=100, help='Resolution of saved chart PNGs (default: 100; use 150+ for print quality)')
+    parser.add_argument('--chart-engine', choices=['matplotlib', 'pillow'], default='matplotlib', help='Renderer for the per-week --weekly charts; pillow is much faster but plainer (default: matplotlib)')
+    parser.add_argument('--chart-workers', type=int, default=None, help='Worker processes for per-day and per-week --weekly charts (default: CPU count; 1 renders in-process)')
+    parser.add_argument('--chart-pdf', action='store_true', help='Write the per-day charts of a date range (daily or --instance-id) as one multi-page PDF instead of one PNG per day')
+    parser.add_argument('--tight-charts', action='store_true', help='Crop chart margins to the drawn content (renders each chart twice, slower)')
     
     args = parser.parse_args()
+    # An immutable connection cannot write, so index creation would fail
+    if args.immutable and args.create_indexes:
+        parser.error("--immutable cannot be combined with --create-indexes")
+    
+    # VRChat display names often fall outside the console code page (e.g.
+    # cp1252 on Windows); print '?' for those characters instead of failing
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(errors='replace')
+    
+    # --serve answers in CSV on stdout; status lines go to stderr so a
+    # client reading the protocol never sees them
+    stdout = sys.stdout
+    if args.serve:
+        sys.stdout = sys.stderr
+    sys.stdout.write(theme_log.getvalue())
     
     # Determine theme and color mode
     theme = get_theme(args.theme)
@@ -2535,6 +2982,12 @@ Common flags:
     # Logos disabled (file/url removed)
     logo_img = None
     
+    # Read the clock once for the date defaults below and for run_ts, the
+    # timestamp suffix that keeps several runs on the same day from overwriting
+    now = datetime.now()
+    today = now.strftime('%Y-%m-%d')
+    run_ts = now.strftime('%Y%m%d-%H%M%S')
+    
     # Determine dates to query
     is_date_range = args.start_date and args.end_date
     
@@ -2542,17 +2995,15 @@ Common flags:
         # Parse month argument if provided (YYYY-MM format) or use current month
         if args.monthly == 'current':
             # Use current month if no specific month provided
-            today = datetime.now()
-            year = today.year
-            month = today.month
+            year = now.year
+            month = now.month
         else:
             try:
                 month_date = datetime.strptime(args.monthly, '%Y-%m')
                 year = month_date.year
                 month = month_date.month
             except ValueError:
-                print(f"Error: Invalid month format '{args.monthly}'. Use YYYY-MM (e.g., 2025-12)")
-                sys.exit(1)
+                parser.error(f"invalid month format '{args.monthly}'. Use YYYY-MM (e.g., 2025-12)")
         
         # Calculate first and last day of month
         first_day = datetime(year, month, 1).strftime('%Y-%m-%d')
@@ -2563,19 +3014,10 @@ Common flags:
             args.start_date = first_day
         if not args.end_date:
             args.end_date = last_day
-    elif args.weekly:
+    elif args.weekly or args.day_of_week or args.average:
+        # Range reports default to today
         if not args.start_date:
-            args.start_date = datetime.now().strftime('%Y-%m-%d')
-        if not args.end_date:
-            args.end_date = args.start_date
-    elif args.day_of_week:
-        if not args.start_date:
-            args.start_date = datetime.now().strftime('%Y-%m-%d')
-        if not args.end_date:
-            args.end_date = args.start_date
-    elif args.average:
-        if not args.start_date:
-            args.start_date = datetime.now().strftime('%Y-%m-%d')
+            args.start_date = today
         if not args.end_date:
             args.end_date = args.start_date
     elif is_date_range:
@@ -2583,13 +3025,43 @@ Common flags:
         pass
     else:
         if not args.date:
-            args.date = datetime.now().strftime('%Y-%m-%d')
+            args.date = today
     
-    # Connect to database
-    db = VRCXDatabase(DATABASE_PATH)
-    db.connect()
+    # List modes are one small query: reject bad arguments before opening
+    # the database and skip the range preload and rollup refresh below
+    is_listing = args.list_worlds or args.list_instances
+    if args.list_instances and not args.world_id:
+        parser.error("--list-instances requires --world-id")
     
+    # Connect to database; leaving the with block closes it however the run ends
+    try:
+        with VRCXDatabase(resolve_database_path(), cache_results=not args.no_cache, immutable=args.immutable) as db:
+            # One query helper shared by every print/chart/export step below
+            query = VRCXQuery(db)
+            if args.create_indexes:
+                db.ensure_indexes()
+            if args.rollup_cache and not is_listing:
+                rollup_path = os.getenv('VRCX_ROLLUP_PATH') or Path(os.getenv('VRCX_REPORTS_OUTPUT_PATH', './vrcx_exports')) / '.vrcx_rollup.sqlite3'
+                db.attach_rollup(rollup_path)
+
+            # Daily and weekly range reports run several different aggregations over
+            # the same days (summary, per-day charts, exports); scan the range once
+            is_filtered = is_listing or args.instance_id or args.world_id
+            if not is_filtered and (args.weekly or (is_date_range and args.monthly is None and not (args.day_of_week or args.average))):
+                db.preload_range(args.start_date, args.end_date)
+
+            _run_reports(args, db, query, stdout, today, run_ts, is_date_range, theme, logo_img)
+    finally:
+        sys.stdout = stdout
+
+
+def _run_reports(args, db, query, stdout, today, run_ts, is_date_range, theme, logo_img):
+    """Run the requested reports against the open database (main() closes it)."""
     try:
+        if args.serve:
+            serve_date_queries(query, args.unique, stream_out=stdout)
+            return
+        
         # Show available tables (if verbose)
         if args.verbose:
             print(f"\nAvailable tables:")
@@ -2604,21 +3076,17 @@ Common flags:
         if args.list_worlds:
             # List all worlds in the date range
             if not args.start_date:
-                args.start_date = args.date or datetime.now().strftime('%Y-%m-%d')
+                args.start_date = args.date or today
             if not args.end_date:
                 args.end_date = args.start_date
-            print_world_list(db, args.start_date, args.end_date)
+            print_world_list(query, args.start_date, args.end_date)
         elif args.list_instances:
             # List all instances for a specific world
-            if not args.world_id:
-                print("Error: --list-instances requires --world-id")
-                db.close()
-                return
             if not args.start_date:
-                args.start_date = args.date or datetime.now().strftime('%Y-%m-%d')
+                args.start_date = args.date or today
             if not args.end_date:
                 args.end_date = args.start_date
-            print_instances_for_world(db, args.world_id, args.world_name, args.start_date, args.end_date)
+            print_instances_for_world(query, args.world_id, args.world_name, args.start_date, args.end_date)
         elif args.instance_id:
             # Run reports filtered to a specific instance - show hourly attendance
             
@@ -2627,71 +3095,63 @@ Common flags:
                 args.instance_id = f"{args.world_id}:{args.instance_id}"
             
             if not args.start_date:
-                args.start_date = args.date or datetime.now().strftime('%Y-%m-%d')
+                args.start_date = args.date or today
             if not args.end_date:
                 args.end_date = args.start_date
             
             # Generate hourly reports for instance (don't return early, let it continue to chart generation)
             if args.date:
-                print_hour_by_hour_summary_for_instance(db, args.instance_id, args.date, args.unique)
+                print_hour_by_hour_summary_for_instance(query, args.instance_id, args.date, args.unique)
             elif is_date_range:
                 # For date ranges with instance filter, show hourly for each day
                 print(f"\nHourly Attendance by Instance - {args.instance_id}")
-                start = datetime.strptime(args.start_date, '%Y-%m-%d')
-                end = datetime.strptime(args.end_date, '%Y-%m-%d')
-                current = start
-                
-                while current <= end:
-                    date_str = current.strftime('%Y-%m-%d')
-                    print_hour_by_hour_summary_for_instance(db, args.instance_id, date_str, args.unique)
-                    current += timedelta(days=1)
+                # One ranged query; the per-day reports and charts below hit the cache
+                query.prefetch_location_hours(args.start_date, args.end_date, instance_id=args.instance_id)
+                for date_str in _date_range(args.start_date, args.end_date):
+                    print_hour_by_hour_summary_for_instance(query, args.instance_id, date_str, args.unique)
         elif args.world_id:
             # Run reports filtered to a specific world
             if args.world_name is None:
                 args.world_name = args.world_id
             
             if args.date:
-                print_hour_by_hour_summary_for_world(db, args.world_id, args.world_name, args.date, args.unique)
+                print_hour_by_hour_summary_for_world(query, args.world_id, args.world_name, args.date, args.unique)
             elif is_date_range:
                 # For date ranges with world filter, show hourly for each day
                 print(f"\nHourly Attendance by World - {args.world_id}")
-                start = datetime.strptime(args.start_date, '%Y-%m-%d')
-                end = datetime.strptime(args.end_date, '%Y-%m-%d')
-                current = start
-                
-                while current <= end:
-                    date_str = current.strftime('%Y-%m-%d')
-                    print_hour_by_hour_summary_for_world(db, args.world_id, args.world_name, date_str, args.unique)
-                    current += timedelta(days=1)
+                query.prefetch_location_hours(args.start_date, args.end_date, world_id=args.world_id)
+                for date_str in _date_range(args.start_date, args.end_date):
+                    print_hour_by_hour_summary_for_world(query, args.world_id, args.world_name, date_str, args.unique)
         elif args.monthly is not None:
-            print_monthly_summary(db, args.start_date, args.end_date, args.unique)
+            print_monthly_summary(query, args.start_date, args.end_date, args.unique)
         elif args.weekly:
-            print_weekly_day_of_week_breakdown(db, args.start_date, args.end_date)
+            print_weekly_day_of_week_breakdown(query, args.start_date, args.end_date, args.unique)
         elif args.day_of_week:
-            print_day_of_week_average(db, args.start_date, args.end_date, args.unique)
+            print_day_of_week_average(query, args.start_date, args.end_date, args.unique)
         elif args.average:
-            print_hour_by_hour_average(db, args.start_date, args.end_date, args.unique)
+            print_hour_by_hour_average(query, args.start_date, args.end_date, args.unique)
         elif is_date_range:
-            print_daily_hourly_summary(db, args.start_date, args.end_date)
+            print_daily_hourly_summary(query, args.start_date, args.end_date)
         else:
-            print_location_history(db, args.date)
-            print_hour_by_hour_summary(db, args.date, args.unique)
+            print_location_history(query, args.date)
+            print_hour_by_hour_summary(query, args.date, args.unique)
         
         # Skip chart generation if just listing worlds or instances
         if args.list_worlds or args.list_instances:
             print(f"\n[OK] List completed")
-            db.close()
             return
         
-        # Export charts (always generated)
+        # Nothing left to write without charts or exports; matplotlib is never loaded
+        if args.no_charts and not args.export_data:
+            print(f"\n[OK] Report completed")
+            return
+        
+        # Export charts (unless --no-charts) and data files
         output_dir = Path(os.getenv('VRCX_REPORTS_OUTPUT_PATH', './vrcx_exports'))
         output_dir.mkdir(exist_ok=True)
 
-        # Timestamp suffix so multiple runs on the same day don't overwrite
-        run_ts = datetime.now().strftime('%Y%m%d-%H%M%S')
-
         print(f"\n{'='*80}")
-        print("GENERATING CHARTS")
+        print("EXPORTING DATA" if args.no_charts else "GENERATING CHARTS")
         print(f"{'='*80}")
 
         if args.monthly is not None:
@@ -2701,16 +3161,15 @@ Common flags:
             filename_base += f"_{run_ts}"
 
             chart_label = "Monthly Daily Breakdown - Unique Visitors" if args.unique else "Monthly Daily Breakdown - All Visitors"
-            chart_files = create_monthly_charts(db, str(output_dir), args.start_date, args.end_date, chart_label, args.unique, run_ts, logo_img, args.use_color, theme)
-            print(f"[OK] Created {len(chart_files)} monthly charts")
+            if not args.no_charts:
+                chart_files = create_monthly_charts(query, str(output_dir), args.start_date, args.end_date, chart_label, args.unique, run_ts, logo_img, args.use_color, theme, dpi=args.chart_dpi, tight=args.tight_charts)
+                print(f"[OK] Created {len(chart_files)} monthly charts")
 
             if args.export_data:
                 csv_file = output_dir / f"{filename_base}.csv"
                 xlsx_file = output_dir / f"{filename_base}.xlsx"
-                export_to_csv(db, str(csv_file), start_date_str=args.start_date,
-                             end_date_str=args.end_date, is_monthly=True, is_unique=args.unique)
-                export_to_excel(db, str(xlsx_file), start_date_str=args.start_date,
-                               end_date_str=args.end_date, is_monthly=True, is_unique=args.unique)
+                export_data(query, str(csv_file), str(xlsx_file), start_date_str=args.start_date,
+                            end_date_str=args.end_date, is_monthly=True, is_unique=args.unique)
 
         elif args.weekly:
             filename_base = f"vrcx_weekly_{args.start_date}_to_{args.end_date}"
@@ -2719,18 +3178,15 @@ Common flags:
             filename_base += f"_{run_ts}"
 
             chart_label = "Weekly Breakdown - Unique Visitors" if args.unique else "Weekly Breakdown - All Visitors"
-            chart_files = create_weekly_charts(db, str(output_dir), args.start_date, args.end_date, chart_label, args.unique, logo_img, args.use_color, theme)
-            print(f"[OK] Created {len(chart_files)} individual weekly charts")
-            combined_chart = output_dir / f"{filename_base}_combined.png"
-            create_combined_weekly_chart(db, str(combined_chart), args.start_date, args.end_date, chart_label, args.unique, logo_img, args.use_color, theme)
+            if not args.no_charts:
+                combined_chart = output_dir / f"{filename_base}_combined.png"
+                chart_files = create_weekly_outputs(query, str(output_dir), str(combined_chart), args.start_date, args.end_date, chart_label, args.unique, logo_img, args.use_color, theme, dpi=args.chart_dpi, tight=args.tight_charts, engine=args.chart_engine, max_workers=args.chart_workers)
 
             if args.export_data:
                 csv_file = output_dir / f"{filename_base}.csv"
                 xlsx_file = output_dir / f"{filename_base}.xlsx"
-                export_to_csv(db, str(csv_file), start_date_str=args.start_date,
-                             end_date_str=args.end_date, is_weekly=True, is_unique=args.unique)
-                export_to_excel(db, str(xlsx_file), start_date_str=args.start_date,
-                               end_date_str=args.end_date, is_weekly=True, is_unique=args.unique)
+                export_data(query, str(csv_file), str(xlsx_file), start_date_str=args.start_date,
+                            end_date_str=args.end_date, is_weekly=True, is_unique=args.unique)
 
         elif args.day_of_week:
             filename_base = f"vrcx_day_of_week_{args.start_date}_to_{args.end_date}"
@@ -2740,15 +3196,14 @@ Common flags:
 
             chart_label = "Day of Week - Unique Visitors" if args.unique else "Day of Week - All Visitors"
             chart_file = output_dir / f"{filename_base}.png"
-            create_day_of_week_chart(db, str(chart_file), args.start_date, args.end_date, chart_label, args.unique, logo_img, args.use_color, theme)
+            if not args.no_charts:
+                create_day_of_week_chart(query, str(chart_file), args.start_date, args.end_date, chart_label, args.unique, logo_img, args.use_color, theme, dpi=args.chart_dpi, tight=args.tight_charts)
 
             if args.export_data:
                 csv_file = output_dir / f"{filename_base}.csv"
                 xlsx_file = output_dir / f"{filename_base}.xlsx"
-                export_to_csv(db, str(csv_file), start_date_str=args.start_date,
-                             end_date_str=args.end_date, is_day_of_week=True, is_unique=args.unique)
-                export_to_excel(db, str(xlsx_file), start_date_str=args.start_date,
-                               end_date_str=args.end_date, is_day_of_week=True, is_unique=args.unique)
+                export_data(query, str(csv_file), str(xlsx_file), start_date_str=args.start_date,
+                            end_date_str=args.end_date, is_day_of_week=True, is_unique=args.unique)
 
         elif args.average:
             filename_base = f"vrcx_average_{args.start_date}_to_{args.end_date}"
@@ -2758,15 +3213,14 @@ Common flags:
 
             chart_label = "Average Hourly Attendance - Unique Visitors" if args.unique else "Average Hourly Attendance - All Visitors"
             chart_file = output_dir / f"{filename_base}.png"
-            create_average_chart(db, str(chart_file), args.start_date, args.end_date, chart_label, args.unique, logo_img, args.use_color, theme)
+            if not args.no_charts:
+                create_average_chart(query, str(chart_file), args.start_date, args.end_date, chart_label, args.unique, logo_img, args.use_color, theme, dpi=args.chart_dpi, tight=args.tight_charts)
 
             if args.export_data:
                 csv_file = output_dir / f"{filename_base}.csv"
                 xlsx_file = output_dir / f"{filename_base}.xlsx"
-                export_to_csv(db, str(csv_file), start_date_str=args.start_date,
-                             end_date_str=args.end_date, is_average=True, is_unique=args.unique)
-                export_to_excel(db, str(xlsx_file), start_date_str=args.start_date,
-                               end_date_str=args.end_date, is_average=True, is_unique=args.unique)
+                export_data(query, str(csv_file), str(xlsx_file), start_date_str=args.start_date,
+                            end_date_str=args.end_date, is_average=True, is_unique=args.unique)
 
         elif args.instance_id:
             filename_base = f"vrcx_instance_{args.date or 'range'}"
@@ -2779,38 +3233,26 @@ Common flags:
             if args.date:
                 # Single day for instance
                 chart_file = output_dir / f"{filename_base}.png"
-                create_daily_chart_for_instance(db, str(chart_file), args.instance_id, args.date, chart_label, args.unique, args.use_color, theme)
+                if not args.no_charts:
+                    create_daily_chart_for_instance(query, str(chart_file), args.instance_id, args.date, chart_label, args.unique, args.use_color, theme, dpi=args.chart_dpi, tight=args.tight_charts)
                 
                 if args.export_data:
                     csv_file = output_dir / f"{filename_base}.csv"
-                    export_to_csv_for_instance(db, str(csv_file), args.instance_id, args.date, args.unique)
+                    export_to_csv_for_instance(query, str(csv_file), args.instance_id, args.date, args.unique)
             elif is_date_range:
-                # Date range for instance - generate chart for each day
-                start = datetime.strptime(args.start_date, '%Y-%m-%d')
-                end = datetime.strptime(args.end_date, '%Y-%m-%d')
-                current = start
-                chart_count = 0
-                
-                while current <= end:
-                    date_str = current.strftime('%Y-%m-%d')
-                    chart_filename = f"vrcx_instance_{date_str}"
-                    if args.unique:
-                        chart_filename += "_unique"
-                    chart_filename += f"_{run_ts}"
-                    chart_file = output_dir / f"{chart_filename}.png"
-                    create_daily_chart_for_instance(db, str(chart_file), args.instance_id, date_str, chart_label, args.unique, args.use_color, theme)
-                    chart_count += 1
-                    current += timedelta(days=1)
-                
-                print(f"[OK] Created {chart_count} instance daily charts")
+                range_base = f"vrcx_instance_{args.start_date}_to_{args.end_date}{'_unique' if args.unique else ''}_{run_ts}"
+                if not args.no_charts:
+                    # Date range for instance - generate chart for each day
+                    pdf_file = str(output_dir / f"{range_base}.pdf") if args.chart_pdf else None
+                    chart_files = create_daily_charts(query, str(output_dir), _date_range(args.start_date, args.end_date), "vrcx_instance", run_ts, chart_label, args.unique, None, args.use_color, theme,
+                                                      dpi=args.chart_dpi, tight=args.tight_charts, instance_id=args.instance_id, max_workers=args.chart_workers, pdf_file=pdf_file)
+                    if not pdf_file:
+                        print(f"[OK] Created {len(chart_files)} instance daily charts")
                 
                 if args.export_data:
-                    csv_file = output_dir / f"vrcx_instance_{args.start_date}_to_{args.end_date}"
-                    if args.unique:
-                        csv_file += "_unique"
-                    csv_file += f"_{run_ts}.csv"
+                    csv_file = output_dir / f"{range_base}.csv"
                     # Export the most recent day for CSV when doing date range
-                    export_to_csv_for_instance(db, str(csv_file), args.instance_id, args.end_date, args.unique)
+                    export_to_csv_for_instance(query, str(csv_file), args.instance_id, args.end_date, args.unique)
 
         elif is_date_range:
             filename_base = f"vrcx_daily_{args.start_date}_to_{args.end_date}"
@@ -2818,33 +3260,21 @@ Common flags:
                 filename_base += "_unique"
             filename_base += f"_{run_ts}"
 
-            # Generate hourly charts for each day in the range
-            chart_label = "Hourly Attendance - Unique Visitors" if args.unique else "Hourly Attendance - All Visitors"
-            start = datetime.strptime(args.start_date, '%Y-%m-%d')
-            end = datetime.strptime(args.end_date, '%Y-%m-%d')
-            current = start
-            chart_count = 0
-            
-            while current <= end:
-                date_str = current.strftime('%Y-%m-%d')
-                chart_filename = f"vrcx_hourly_{date_str}"
-                if args.unique:
-                    chart_filename += "_unique"
-                chart_filename += f"_{run_ts}"
-                chart_file = output_dir / f"{chart_filename}.png"
-                create_daily_chart(db, str(chart_file), date_str, chart_label, args.unique, logo_img, args.use_color, theme)
-                chart_count += 1
-                current += timedelta(days=1)
-            
-            print(f"[OK] Created {chart_count} daily charts")
+            if not args.no_charts:
+                # Generate hourly charts for each day in the range
+                chart_label = "Hourly Attendance - Unique Visitors" if args.unique else "Hourly Attendance - All Visitors"
+                dates = _date_range(args.start_date, args.end_date)
+                pdf_file = str(output_dir / f"{filename_base}.pdf") if args.chart_pdf else None
+                chart_files = create_daily_charts(query, str(output_dir), dates, "vrcx_hourly", run_ts, chart_label, args.unique, logo_img, args.use_color, theme,
+                                                  dpi=args.chart_dpi, tight=args.tight_charts, max_workers=args.chart_workers, pdf_file=pdf_file)
+                if not pdf_file:
+                    print(f"[OK] Created {len(chart_files)} daily charts")
 
             if args.export_data:
                 csv_file = output_dir / f"{filename_base}.csv"
                 xlsx_file = output_dir / f"{filename_base}.xlsx"
-                export_to_csv(db, str(csv_file), start_date_str=args.start_date,
-                             end_date_str=args.end_date, is_daily=True, is_unique=args.unique)
-                export_to_excel(db, str(xlsx_file), start_date_str=args.start_date,
-                               end_date_str=args.end_date, is_daily=True, is_unique=args.unique)
+                export_data(query, str(csv_file), str(xlsx_file), start_date_str=args.start_date,
+                            end_date_str=args.end_date, is_daily=True, is_unique=args.unique)
 
         else:
             filename_base = f"vrcx_hourly_{args.date}"
@@ -2854,13 +3284,13 @@ Common flags:
 
             chart_label = "Hourly Attendance - Unique Visitors" if args.unique else "Hourly Attendance - All Visitors"
             chart_file = output_dir / f"{filename_base}.png"
-            create_daily_chart(db, str(chart_file), args.date, chart_label, args.unique, logo_img, args.use_color, theme)
+            if not args.no_charts:
+                create_daily_chart(query, str(chart_file), args.date, chart_label, args.unique, logo_img, args.use_color, theme, dpi=args.chart_dpi, tight=args.tight_charts)
 
             if args.export_data:
                 csv_file = output_dir / f"{filename_base}.csv"
                 xlsx_file = output_dir / f"{filename_base}.xlsx"
-                export_to_csv(db, str(csv_file), date_str=args.date, is_unique=args.unique)
-                export_to_excel(db, str(xlsx_file), date_str=args.date, is_unique=args.unique)
+                export_data(query, str(csv_file), str(xlsx_file), date_str=args.date, is_unique=args.unique)
 
         # Completion message
         if args.export_data:
@@ -2872,9 +3302,8 @@ Common flags:
         print(f"\n✗ Error: {e}")
         import traceback
         traceback.print_exc()
-    
-    finally:
-        db.close()
+        # Non-zero status so scripts can tell the run failed (the database still closes)
+        sys.exit(1)
 
 
 if __name__ == '__main__':